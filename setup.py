@@ -22,6 +22,9 @@ setup(
     zip_safe=False,
     include_package_data=True,
     install_requires=install_requires,
+    extras_require={
+        "async": ["httpx[http2]>=0.24.0"]
+    },
     python_requires=">=3.8",
     license="MIT",
     keywords=["frappe", "erpnext", "wix", "sync", "ecommerce"],
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import asyncio
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+# httpx is optional - only needed when the async transport is selected
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# HTTP/2 needs the h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Default cap on requests in flight from one worker
+DEFAULT_MAX_IN_FLIGHT = 50
+
+# Throttled (429) and server error responses are retried with exponential backoff
+# starting at RETRY_BACKOFF seconds, unless Wix says when to come back (Retry-After)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 4
+RETRY_BACKOFF = 1
+MAX_RETRY_DELAY = 60
+
+def get_retry_delay(response, attempt):
+    """Seconds to wait before retrying `response`, from Retry-After or backoff"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), MAX_RETRY_DELAY)
+    return min(RETRY_BACKOFF * 2 ** attempt, MAX_RETRY_DELAY)
+
+class AsyncWixTransport:
+    """
+    asyncio transport for the Wix catalog endpoints used by WixSyncManager
+    Coroutines only do HTTP - they never touch frappe or the database, so the
+    manager prepares payloads before and records results after each batch
+    """
+
+    def __init__(self, base_url, headers, max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=30, rate_limit=None):
+        if httpx is None:
+            raise Exception('The async transport needs httpx: pip install "httpx[http2]"')
+
+        self.base_url = base_url
+        self.headers = headers
+        self.max_in_flight = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+        self.timeout = timeout
+        # Requests per minute; starts are spaced evenly so a batch cannot burst past it
+        self.interval = 60.0 / rate_limit if rate_limit else 0
+        self.next_request_at = 0
+        self.client = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        # Created inside the running loop so they bind to it
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=HTTP2_AVAILABLE,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_in_flight)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+
+    async def wait_for_rate_limit(self):
+        """Reserve the next request start allowed by the rate limit and wait for it"""
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_request_at)
+        self.next_request_at = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def request(self, method, path, payload=None, idempotent=True):
+        """
+        Send one request, waiting for the rate limit and a free slot; returns (status_code, text)
+        429 and 5xx responses are retried - only 429 for non-idempotent requests, as a
+        create that failed with a server error may still have gone through
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            await self.wait_for_rate_limit()
+            async with self.semaphore:
+                response = await self.client.request(method, path, json=payload)
+
+            retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES)
+            if not retryable or attempt == MAX_RETRIES:
+                break
+
+            # Back off outside the semaphore so other requests can use the slot
+            await asyncio.sleep(get_retry_delay(response, attempt))
+
+        return response.status_code, response.text
+
+    async def create_product(self, payload):
+        return await self.request("POST", "/stores-catalog/v3/products", payload, idempotent=False)
+
+    async def update_product(self, product_id, payload):
+        return await self.request("PATCH", f"/stores-catalog/v3/products/{product_id}", payload)
+
+    async def query_products(self, query=None):
+        return await self.request("POST", "/stores-catalog/v3/products/query", query or {})
+
+    async def bulk_update_visibility(self, product_ids, visible):
+        return await self.request("POST", "/stores-catalog/v3/bulk/products/update-by-filter", {
+            "filter": {"id": {"$in": list(product_ids)}},
+            "product": {"visible": visible}
+        })
+
+    async def bulk_delete_products(self, product_ids):
+        return await self.request("POST", "/stores-catalog/v3/bulk/products/delete",
+                                  {"productIds": list(product_ids)})
+
+    async def send_operation(self, operation):
+        """Send a create/update operation prepared by WixSyncManager.prepare_sync_operation"""
+        if operation["action"] == "update":
+            return await self.update_product(operation["product_id"], operation["payload"])
+        return await self.create_product(operation["payload"])
+
+    async def send_operations(self, operations):
+        """Send operations concurrently; exceptions are returned in place of results"""
+        return await asyncio.gather(*(self.send_operation(op) for op in operations),
+                                    return_exceptions=True)
+
+def send_operations(base_url, headers, operations, max_in_flight=DEFAULT_MAX_IN_FLIGHT, rate_limit=None):
+    """Blocking entry point - run one batch of operations on a fresh event loop"""
+    async def run():
+        async with AsyncWixTransport(base_url, headers, max_in_flight, rate_limit=rate_limit) as transport:
+            return await transport.send_operations(operations)
+
+    return asyncio.run(run())
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import json
+import requests
+from datetime import datetime
+
+# Wix Stores app id, owner of the product catalog items placed in categories
+WIX_STORES_APP_ID = "215238eb-22a5-4c36-9e7b-e7c08025e04e"
+
+CATEGORY_TREE_REFERENCE = {"appNamespace": "@wix/stores"}
+
+# Items per bulk add/remove membership request
+MEMBERSHIP_BATCH_SIZE = 100
+
+def sync_wix_categories(sync_manager):
+    """
+    Mirror the Item Group tree as Wix categories and update product membership
+    A category holds the products of its Item Group and all of its descendants,
+    so only the diff against the last run is sent, in bulk batches
+    """
+    groups = frappe.get_all("Item Group",
+                            fields=["name", "parent_item_group", "lft", "rgt"],
+                            order_by="lft asc")
+    maps = {m.item_group: m for m in frappe.get_all("Wix Category Map",
+                                                     fields=["name", "item_group", "wix_category_id",
+                                                             "parent_wix_category_id", "member_product_ids"])}
+    group_names = {g.name for g in groups}
+    summary = {"created": 0, "moved": 0, "deleted": 0, "added": 0, "removed": 0}
+
+    # Parents come before children in lft order, so their category ids are known
+    category_ids = {}
+    for group in groups:
+        if not group.parent_item_group:
+            # The tree root has no Wix counterpart; its children are top level
+            continue
+
+        parent_category_id = category_ids.get(group.parent_item_group) or ""
+        category_map = maps.get(group.name)
+
+        if not category_map or not category_map.wix_category_id:
+            category_id = create_category(sync_manager, group.name, parent_category_id)
+            save_category_map(group.name, category_id, parent_category_id)
+            maps[group.name] = frappe._dict(wix_category_id=category_id, member_product_ids="[]")
+            summary["created"] += 1
+        else:
+            category_id = category_map.wix_category_id
+            if (category_map.parent_wix_category_id or "") != parent_category_id:
+                move_category(sync_manager, category_id, parent_category_id)
+                save_category_map(group.name, category_id, parent_category_id)
+                summary["moved"] += 1
+
+        category_ids[group.name] = category_id
+
+    desired = get_desired_membership(sync_manager, groups)
+
+    for group_name, category_id in category_ids.items():
+        previous = set(frappe.parse_json(maps[group_name].member_product_ids or "[]"))
+        current = desired.get(group_name, set())
+        to_add = sorted(current - previous)
+        to_remove = sorted(previous - current)
+
+        if not to_add and not to_remove:
+            continue
+
+        update_membership(sync_manager, category_id, to_add, "add-items")
+        update_membership(sync_manager, category_id, to_remove, "remove-items")
+        frappe.db.set_value("Wix Category Map", group_name, {
+            "member_product_ids": json.dumps(sorted(current)),
+            "member_count": len(current),
+            "last_synced": datetime.now()
+        })
+        frappe.db.commit()
+
+        summary["added"] += len(to_add)
+        summary["removed"] += len(to_remove)
+
+    # Item Groups that no longer exist lose their Wix category
+    for group_name, category_map in maps.items():
+        if group_name not in group_names:
+            if category_map.wix_category_id:
+                delete_category(sync_manager, category_map.wix_category_id)
+            frappe.delete_doc("Wix Category Map", group_name, ignore_permissions=True, force=True)
+            frappe.db.commit()
+            summary["deleted"] += 1
+
+    return summary
+
+def get_desired_membership(sync_manager, groups):
+    """
+    Product ids each Item Group category should contain, including descendants
+    Built from one Item query and the product id mapping
+    """
+    product_ids = sync_manager.get_product_id_map()
+    items = frappe.db.sql("""
+        SELECT name, item_group
+        FROM `tabItem`
+        WHERE is_sales_item = 1
+        AND disabled = 0
+        AND IFNULL(variant_of, '') = ''
+    """, as_dict=True)
+
+    parents = {g.name: g.parent_item_group for g in groups}
+    membership = {}
+
+    for item in items:
+        product_id = product_ids.get(item.name)
+        if not product_id:
+            continue
+
+        group_name = item.item_group
+        while group_name and parents.get(group_name):
+            membership.setdefault(group_name, set()).add(product_id)
+            group_name = parents.get(group_name)
+
+    return membership
+
+def save_category_map(item_group, category_id, parent_category_id):
+    if frappe.db.exists("Wix Category Map", item_group):
+        frappe.db.set_value("Wix Category Map", item_group, {
+            "wix_category_id": category_id,
+            "parent_wix_category_id": parent_category_id
+        })
+    else:
+        frappe.get_doc({
+            "doctype": "Wix Category Map",
+            "item_group": item_group,
+            "wix_category_id": category_id,
+            "parent_wix_category_id": parent_category_id,
+            "member_product_ids": "[]"
+        }).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+def create_category(sync_manager, name, parent_category_id):
+    url = f"{sync_manager.base_url}/categories/v1/categories"
+    category = {"name": name, "visible": True}
+    if parent_category_id:
+        category["parentCategory"] = {"id": parent_category_id}
+
+    response = requests.post(url, headers=sync_manager.get_headers(),
+                             json={"category": category, "treeReference": CATEGORY_TREE_REFERENCE},
+                             timeout=30)
+    if response.status_code not in [200, 201]:
+        raise Exception(f"Category create error {response.status_code}: {response.text}")
+    return response.json().get("category", {}).get("id")
+
+def move_category(sync_manager, category_id, parent_category_id):
+    url = f"{sync_manager.base_url}/categories/v1/categories/{category_id}/move"
+    payload = {"treeReference": CATEGORY_TREE_REFERENCE, "position": "LAST"}
+    if parent_category_id:
+        payload["parentCategoryId"] = parent_category_id
+
+    response = requests.post(url, headers=sync_manager.get_headers(), json=payload, timeout=30)
+    if response.status_code != 200:
+        raise Exception(f"Category move error {response.status_code}: {response.text}")
+
+def delete_category(sync_manager, category_id):
+    url = f"{sync_manager.base_url}/categories/v1/categories/{category_id}"
+    response = requests.delete(url, headers=sync_manager.get_headers(),
+                               params={"treeReference.appNamespace": CATEGORY_TREE_REFERENCE["appNamespace"]},
+                               timeout=30)
+    if response.status_code not in [200, 404]:
+        raise Exception(f"Category delete error {response.status_code}: {response.text}")
+
+def update_membership(sync_manager, category_id, product_ids, operation):
+    """Add or remove products from a category in MEMBERSHIP_BATCH_SIZE batches"""
+    url = f"{sync_manager.base_url}/categories/v1/bulk/categories/{category_id}/{operation}"
+
+    for start in range(0, len(product_ids), MEMBERSHIP_BATCH_SIZE):
+        batch = product_ids[start:start + MEMBERSHIP_BATCH_SIZE]
+        payload = {
+            "items": [{"catalogItemId": product_id, "appId": WIX_STORES_APP_ID} for product_id in batch],
+            "treeReference": CATEGORY_TREE_REFERENCE
+        }
+        response = requests.post(url, headers=sync_manager.get_headers(), json=payload, timeout=60)
+        if response.status_code != 200:
+            raise Exception(f"Category {operation} error {response.status_code}: {response.text}")
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import requests
+import time
+from datetime import datetime
+from frappe.utils import cint
+
+HEALTH_CACHE_KEY = "wix_sync:connection_health"
+
+# Seconds a probe result is served from Redis before Wix is asked again
+HEALTH_CACHE_TTL = 60
+
+# A health check should fail fast rather than hold a web worker
+PROBE_TIMEOUT = 10
+
+def probe_wix_connection(sync_manager):
+    """
+    Request the smallest possible page of products and time it
+    Nothing is written to the database; 401/403 mean the token was rejected
+    """
+    url = f"{sync_manager.base_url}/stores-catalog/v3/products/query"
+    started = time.perf_counter()
+
+    try:
+        response = requests.post(url, headers=sync_manager.get_headers(),
+                                 json={"query": {"cursorPaging": {"limit": 1}}},
+                                 timeout=PROBE_TIMEOUT)
+    except Exception as e:
+        return {
+            "success": False,
+            "token_valid": None,
+            "status_code": None,
+            "latency_ms": round((time.perf_counter() - started) * 1000),
+            "checked_at": str(datetime.now()),
+            "message": f"Connection failed: {str(e)}"
+        }
+
+    latency_ms = round((time.perf_counter() - started) * 1000)
+    success = response.status_code == 200
+
+    if success:
+        message = f"✅ Wix connection successful ({latency_ms} ms)"
+    else:
+        message = f"Connection failed: {response.status_code} - {response.text[:500]}"
+
+    return {
+        "success": success,
+        # Only an auth error says anything about the token
+        "token_valid": True if success else (False if response.status_code in (401, 403) else None),
+        "status_code": response.status_code,
+        "latency_ms": latency_ms,
+        "checked_at": str(datetime.now()),
+        "message": message
+    }
+
+@frappe.whitelist()
+def get_connection_health(refresh=False):
+    """
+    Wix connection health, cached in Redis for HEALTH_CACHE_TTL seconds
+    Cheap enough for monitoring to poll; pass refresh=1 to probe right away
+    """
+    from zm_frappe_wix_sync.api.wix_sync import WixSyncManager
+
+    cache = frappe.cache()
+    if not cint(refresh):
+        health = cache.get_value(HEALTH_CACHE_KEY)
+        if health:
+            return dict(health, cached=True)
+
+    health = probe_wix_connection(WixSyncManager(notify=False))
+    cache.set_value(HEALTH_CACHE_KEY, health, expires_in_sec=HEALTH_CACHE_TTL)
+    return dict(health, cached=False)
+
+def clear_connection_health():
+    """Forget the cached probe, e.g. after the credentials change"""
+    frappe.cache().delete_value(HEALTH_CACHE_KEY)
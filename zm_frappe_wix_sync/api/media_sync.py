@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import hashlib
+import mimetypes
+import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+# Images uploaded in parallel per sync batch
+MEDIA_UPLOAD_CONCURRENCY = 4
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tiff")
+
+# Read size used while hashing local files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def get_item_media_ids(sync_manager, item_doc):
+    """
+    Return Wix media ids for an Item's images, uploading only unseen content
+    Served from the batch resolved by prefetch_item_data; Items outside the
+    batch are resolved on their own
+    """
+    if item_doc.name not in sync_manager._media_cache:
+        sync_manager._media_cache.update(get_media_id_map(sync_manager, [item_doc]))
+    return sync_manager._media_cache.get(item_doc.name) or []
+
+def get_media_id_map(sync_manager, items):
+    """
+    Wix media ids for a batch of Items with one File query and one cache lookup
+    Content not yet on Wix is uploaded through a single bounded pool for the
+    whole batch (or only counted on dry runs)
+    """
+    media_files_by_item = get_media_files_map(items)
+    all_files = [m for media_files in media_files_by_item.values() for m in media_files]
+
+    for media_file in all_files:
+        if not media_file.get("content_hash"):
+            media_file["content_hash"] = get_content_hash(media_file)
+
+    all_files = [m for m in all_files if m.get("content_hash")]
+    cached = get_cached_media_ids([m["content_hash"] for m in all_files])
+
+    # The same content used twice is uploaded once
+    pending = {}
+    for media_file in all_files:
+        if media_file["content_hash"] not in cached:
+            pending.setdefault(media_file["content_hash"], media_file)
+
+    if pending and sync_manager.dry_run:
+        # Planning only - note what would be uploaded and leave it out
+        sync_manager.planned_media_uploads.update(
+            (content_hash, get_upload_request_count(media_file))
+            for content_hash, media_file in pending.items()
+        )
+    elif pending:
+        cached.update(upload_media_files(sync_manager, list(pending.values())))
+
+    media_ids_by_item = {}
+    for item_name, media_files in media_files_by_item.items():
+        media_ids = []
+        for media_file in media_files:
+            media_id = cached.get(media_file.get("content_hash"))
+            if media_id and media_id not in media_ids:
+                media_ids.append(media_id)
+        media_ids_by_item[item_name] = media_ids
+
+    return media_ids_by_item
+
+def get_media_files_map(items):
+    """
+    Image files per Item, main image first, without duplicates
+    Images come from the Item `image` field and image files attached to the Item;
+    stored File content hashes are reused so files are only hashed when unknown
+    """
+    item_names = [item.name for item in items]
+    attached = frappe.get_all("File",
+                              filters={
+                                  "attached_to_doctype": "Item",
+                                  "attached_to_name": ["in", item_names],
+                                  "is_folder": 0
+                              },
+                              fields=["attached_to_name", "file_url", "file_name", "content_hash"],
+                              order_by="creation asc")
+
+    files_by_item = {}
+    for f in attached:
+        if f.file_url:
+            files_by_item.setdefault(f.attached_to_name, {}).setdefault(f.file_url, f)
+
+    # Main images stored on other documents still have a File row with a hash
+    image_urls = [item.image for item in items
+                  if getattr(item, 'image', None)
+                  and item.image not in files_by_item.get(item.name, {})]
+    files_by_url = {}
+    if image_urls:
+        for f in frappe.get_all("File",
+                                filters={"file_url": ["in", list(set(image_urls))], "is_folder": 0},
+                                fields=["file_url", "file_name", "content_hash"]):
+            files_by_url.setdefault(f.file_url, f)
+
+    media_files_by_item = {}
+    for item in items:
+        item_files = files_by_item.get(item.name, {})
+        urls = []
+        if getattr(item, 'image', None):
+            urls.append(item.image)
+        urls.extend(item_files.keys())
+
+        media_files = []
+        for file_url in dict.fromkeys(urls):
+            if not is_image(file_url):
+                continue
+
+            file_info = item_files.get(file_url) or files_by_url.get(file_url) or {}
+            media_files.append({
+                "file_url": file_url,
+                "file_name": file_info.get("file_name") or os.path.basename(file_url.split("?")[0]),
+                "content_hash": file_info.get("content_hash"),
+                "path": get_local_path(file_url)
+            })
+        media_files_by_item[item.name] = media_files
+
+    return media_files_by_item
+
+def is_image(file_url):
+    return file_url.split("?")[0].lower().endswith(IMAGE_EXTENSIONS)
+
+def get_local_path(file_url):
+    """Filesystem path for site files, None for external URLs"""
+    if file_url.startswith("/private/files/"):
+        return frappe.get_site_path("private", "files", file_url[len("/private/files/"):])
+    if file_url.startswith("/files/"):
+        return frappe.get_site_path("public", "files", file_url[len("/files/"):])
+    return None
+
+def get_content_hash(media_file):
+    """
+    MD5 of the file content, matching File.content_hash
+    External images are keyed by their URL since their content is not local
+    """
+    path = media_file.get("path")
+    if not path:
+        return hashlib.md5(media_file["file_url"].encode("utf-8")).hexdigest()
+
+    try:
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except Exception as e:
+        frappe.log_error(f"Could not read image {media_file['file_url']}: {str(e)}")
+        return None
+
+def get_cached_media_ids(content_hashes):
+    """Look up known Wix media ids for a batch of content hashes"""
+    if not content_hashes:
+        return {}
+
+    rows = frappe.get_all("Wix Media Cache",
+                          filters={"name": ["in", list(set(content_hashes))]},
+                          fields=["name", "wix_media_id"])
+    return {row.name: row.wix_media_id for row in rows}
+
+def upload_media_files(sync_manager, media_files):
+    """
+    Upload files to the Wix Media Manager with bounded concurrency
+    Worker threads only do HTTP and file reads; cache rows are written here
+    """
+    headers = sync_manager.get_headers()
+    base_url = sync_manager.base_url
+    uploaded = {}
+
+    with ThreadPoolExecutor(max_workers=MEDIA_UPLOAD_CONCURRENCY) as executor:
+        futures = [
+            (media_file, executor.submit(upload_media_file, base_url, headers, media_file))
+            for media_file in media_files
+        ]
+
+        for media_file, future in futures:
+            try:
+                media_id = future.result()
+            except Exception as e:
+                frappe.log_error(f"Wix media upload failed for {media_file['file_url']}: {str(e)}")
+                continue
+
+            if media_id:
+                uploaded[media_file["content_hash"]] = media_id
+                cache_media_id(media_file, media_id)
+
+    frappe.db.commit()
+    return uploaded
+
+def get_upload_request_count(media_file):
+    """Wix requests one upload takes - an import for external URLs, URL + PUT for local files"""
+    return 2 if media_file.get("path") else 1
+
+def upload_media_file(base_url, headers, media_file):
+    """Upload one image and return its Wix media id - runs in a worker thread"""
+    mime_type = mimetypes.guess_type(media_file["file_name"])[0] or "image/jpeg"
+
+    if not media_file.get("path"):
+        # External images are imported by Wix straight from their URL
+        response = requests.post(f"{base_url}/site-media/v1/files/import",
+                                 headers=headers,
+                                 json={
+                                     "url": media_file["file_url"],
+                                     "mediaType": "IMAGE",
+                                     "displayName": media_file["file_name"]
+                                 },
+                                 timeout=30)
+        response.raise_for_status()
+        return response.json().get("file", {}).get("id")
+
+    response = requests.post(f"{base_url}/site-media/v1/files/generate-upload-url",
+                             headers=headers,
+                             json={"mimeType": mime_type, "fileName": media_file["file_name"]},
+                             timeout=30)
+    response.raise_for_status()
+    upload_url = response.json().get("uploadUrl")
+
+    with open(media_file["path"], "rb") as f:
+        response = requests.put(upload_url,
+                                params={"filename": media_file["file_name"]},
+                                headers={"Content-Type": mime_type},
+                                data=f,
+                                timeout=120)
+    response.raise_for_status()
+    return response.json().get("file", {}).get("id")
+
+def cache_media_id(media_file, media_id):
+    """Remember the Wix media id for a content hash"""
+    frappe.db.savepoint("wix_media_cache")
+    try:
+        frappe.get_doc({
+            "doctype": "Wix Media Cache",
+            "content_hash": media_file["content_hash"],
+            "wix_media_id": media_id,
+            "file_name": media_file["file_name"],
+            "file_url": media_file["file_url"]
+        }).insert(ignore_permissions=True)
+    except frappe.DuplicateEntryError:
+        # Another worker uploaded the same content first - keep the rest of the transaction
+        frappe.db.rollback(save_point="wix_media_cache")
+    except Exception as e:
+        frappe.db.rollback(save_point="wix_media_cache")
+        frappe.log_error(f"Failed to cache Wix media id: {str(e)}")
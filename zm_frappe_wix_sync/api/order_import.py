@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import json
+import requests
+from frappe.utils import flt, getdate, nowdate
+
+# Orders fetched per cursor page; each page is imported in one transaction
+ORDER_PAGE_SIZE = 100
+
+# Only orders Wix has approved become Sales Orders
+IMPORTABLE_ORDER_STATUSES = ("APPROVED",)
+
+def import_wix_orders(sync_manager):
+    """
+    Import Wix eCommerce orders updated since the stored watermark
+    Returns a summary dict with created, skipped and failed counts
+    """
+    settings = sync_manager.settings
+    if not settings or not settings.get("order_customer"):
+        frappe.throw("Set an Order Customer in Wix Sync Settings before importing orders")
+
+    watermark = settings.get("order_sync_watermark")
+    summary = {"created": 0, "skipped": 0, "failed": 0, "pages": 0}
+    # After a failed order the watermark stays put so the next run fetches it again;
+    # orders already imported after it are skipped via po_no on that run
+    blocked = False
+
+    for orders in iter_order_pages(sync_manager, watermark):
+        summary["pages"] += 1
+        result = import_order_page(settings, orders)
+        for key in ("created", "skipped", "failed"):
+            summary[key] += result[key]
+
+        # Watermark moves in the same transaction as the page's Sales Orders
+        if not blocked and result["watermark"]:
+            frappe.db.set_single_value("Wix Sync Settings", "order_sync_watermark", result["watermark"])
+        blocked = blocked or bool(result["failed"])
+        frappe.db.commit()
+
+    return summary
+
+def iter_order_pages(sync_manager, watermark=None):
+    """Yield pages of Wix orders sorted by updatedDate, following the cursor"""
+    url = f"{sync_manager.base_url}/ecom/v1/orders/search"
+    search = {
+        "sort": [{"fieldName": "updatedDate", "order": "ASC"}],
+        "cursorPaging": {"limit": ORDER_PAGE_SIZE}
+    }
+    if watermark:
+        search["filter"] = {"updatedDate": {"$gt": watermark}}
+
+    while True:
+        response = requests.post(url, headers=sync_manager.get_headers(),
+                                 json={"search": search}, timeout=30)
+        if response.status_code != 200:
+            raise Exception(f"Order search error {response.status_code}: {response.text}")
+
+        result = response.json()
+        orders = result.get("orders") or []
+        if orders:
+            yield orders
+
+        cursors = result.get("metadata", {}).get("cursors", {})
+        if not orders or not cursors.get("next"):
+            return
+
+        # Wix rejects filter and sort alongside a cursor
+        search = {"cursorPaging": {"limit": ORDER_PAGE_SIZE, "cursor": cursors["next"]}}
+
+def import_order_page(settings, orders):
+    """
+    Create Sales Orders for one page of Wix orders without committing
+    `watermark` in the result is the updatedDate of the last order before the first failure
+    """
+    result = {"created": 0, "skipped": 0, "failed": 0, "watermark": None}
+
+    importable = [o for o in orders if o.get("status") in IMPORTABLE_ORDER_STATUSES]
+    existing = get_imported_order_ids([o["id"] for o in importable])
+    item_map = resolve_line_items(importable)
+
+    for order in orders:
+        if order.get("status") not in IMPORTABLE_ORDER_STATUSES:
+            # Not approved yet - approval changes updatedDate, so it comes back
+            pass
+        elif order["id"] in existing:
+            result["skipped"] += 1
+        else:
+            frappe.db.savepoint("wix_order_import")
+            try:
+                create_sales_order(settings, order, item_map)
+                existing.add(order["id"])
+                result["created"] += 1
+            except Exception as e:
+                frappe.db.rollback(save_point="wix_order_import")
+                result["failed"] += 1
+                frappe.log_error(f"Wix order import failed for order {order.get('number') or order['id']}: {str(e)}")
+
+        if not result["failed"]:
+            result["watermark"] = order.get("updatedDate")
+
+    return result
+
+def get_imported_order_ids(order_ids):
+    """
+    Wix order ids that already have a Sales Order (stored in po_no)
+    Cancelled Sales Orders count too - a cancelled order must not be imported again
+    """
+    if not order_ids:
+        return set()
+
+    return set(frappe.get_all("Sales Order",
+                              filters={"po_no": ["in", order_ids]},
+                              pluck="po_no"))
+
+def resolve_line_items(orders):
+    """
+    Map line item keys to item codes for a page of orders in a few queries
+    SKUs are matched to item codes first, then Wix variant and product ids via
+    Wix Sync Status. Product ids of templates are left out - a template cannot
+    be ordered, so its lines must resolve to a variant
+    """
+    skus = set()
+    product_ids = set()
+    for order in orders:
+        for line in order.get("lineItems") or []:
+            sku = get_line_sku(line)
+            if sku:
+                skus.add(sku)
+            product_id = get_line_product_id(line)
+            if product_id:
+                product_ids.add(product_id)
+
+    item_map = {}
+    if skus:
+        for item_code in frappe.get_all("Item", filters={"name": ["in", list(skus)], "has_variants": 0},
+                                        pluck="name"):
+            item_map[("sku", item_code)] = item_code
+
+    if product_ids:
+        mapped = frappe.get_all("Wix Sync Status",
+                                filters={"wix_product_id": ["in", list(product_ids)]},
+                                fields=["name", "wix_product_id", "wix_variant_ids"])
+        templates = set(frappe.get_all("Item",
+                                       filters={"name": ["in", [row.name for row in mapped] or [""]],
+                                                "has_variants": 1},
+                                       pluck="name"))
+        for row in mapped:
+            for variant_id, item_code in json.loads(row.wix_variant_ids or "{}").items():
+                item_map[("variant", variant_id)] = item_code
+            if row.name not in templates:
+                item_map[("product", row.wix_product_id)] = row.name
+
+    return item_map
+
+def get_line_sku(line):
+    return (line.get("physicalProperties") or {}).get("sku")
+
+def get_line_product_id(line):
+    return (line.get("catalogReference") or {}).get("catalogItemId")
+
+def get_line_variant_id(line):
+    return ((line.get("catalogReference") or {}).get("options") or {}).get("variantId")
+
+def create_sales_order(settings, order, item_map):
+    """Insert (and optionally submit) a Sales Order for one Wix order"""
+    order_date = getdate((order.get("createdDate") or nowdate())[:10])
+    items = []
+
+    for line in order.get("lineItems") or []:
+        item_code = (item_map.get(("sku", get_line_sku(line)))
+                     or item_map.get(("variant", get_line_variant_id(line)))
+                     or item_map.get(("product", get_line_product_id(line))))
+        if not item_code:
+            raise Exception(f"No Item found for Wix line item {line.get('productName', {}).get('original') or line.get('id')}")
+
+        items.append({
+            "item_code": item_code,
+            "qty": flt(line.get("quantity")) or 1,
+            "rate": flt((line.get("price") or {}).get("amount")),
+            "delivery_date": order_date
+        })
+
+    if not items:
+        raise Exception("Order has no line items")
+
+    sales_order = frappe.get_doc({
+        "doctype": "Sales Order",
+        "customer": settings.get("order_customer"),
+        "company": settings.get("order_company") or frappe.defaults.get_defaults().get("company"),
+        "transaction_date": order_date,
+        "delivery_date": order_date,
+        "po_no": order["id"],
+        "po_date": order_date,
+        "set_warehouse": settings.get("order_warehouse"),
+        "items": items
+    })
+    sales_order.flags.ignore_permissions = True
+    sales_order.insert()
+
+    if settings.get("submit_imported_orders"):
+        sales_order.submit()
+
+    return sales_order
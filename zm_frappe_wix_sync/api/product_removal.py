@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import json
+from zm_frappe_wix_sync.api.sync_queue import PRIORITY_LOW, get_queue_for
+
+# Disabled / non-sales Items are hidden on Wix, trashed Items are deleted.
+# Both are queued in Redis and flushed through Wix bulk endpoints.
+ACTION_HIDE = "hide"
+ACTION_DELETE = "delete"
+
+REMOVAL_QUEUE_KEY = "wix_sync:remove_products:{0}"
+
+# Product ids per bulk request
+BULK_BATCH_SIZE = 100
+
+# Flushes a product may fail before it is dropped from the queue
+MAX_REMOVAL_ATTEMPTS = 5
+
+# Set while a flush job is queued, so a burst of removals queues one job.
+# Expires in case the job is lost with its worker.
+FLUSH_JOB_KEY = "wix_sync:removal_flush_pending"
+FLUSH_JOB_TTL = 3600
+
+def queue_product_removal(item_code, wix_product_id, action):
+    """Queue a product for bulk hide/delete once the current transaction commits"""
+    def push():
+        entry = json.dumps({"item_code": item_code, "wix_product_id": wix_product_id})
+        cache = frappe.cache()
+        cache.rpush(REMOVAL_QUEUE_KEY.format(action), entry)
+
+        # Only the first push since the last flush started queues a job
+        if cache.set(cache.make_key(FLUSH_JOB_KEY), 1, nx=True, ex=FLUSH_JOB_TTL):
+            frappe.enqueue(
+                "zm_frappe_wix_sync.api.product_removal.flush_product_removals",
+                queue=get_queue_for(PRIORITY_LOW)
+            )
+
+    frappe.db.after_commit.add(push)
+
+def pop_removal_batch(action, size=BULK_BATCH_SIZE):
+    """Take up to `size` queued entries for an action, one per product"""
+    cache = frappe.cache()
+    batch = {}
+
+    while len(batch) < size:
+        entry = cache.lpop(REMOVAL_QUEUE_KEY.format(action))
+        if not entry:
+            break
+        entry = json.loads(entry)
+        batch[entry["wix_product_id"]] = entry
+
+    return list(batch.values())
+
+def requeue_removal_batch(action, batch):
+    """
+    Put failed entries back so the next flush retries them
+    Returns the entries that ran out of attempts and were dropped instead
+    """
+    cache = frappe.cache()
+    dropped = []
+    for entry in batch:
+        entry["attempts"] = entry.get("attempts", 0) + 1
+        if entry["attempts"] >= MAX_REMOVAL_ATTEMPTS:
+            dropped.append(entry)
+        else:
+            cache.rpush(REMOVAL_QUEUE_KEY.format(action), json.dumps(entry))
+    return dropped
+
+def send_removal(sync_manager, action, product_ids):
+    if action == ACTION_HIDE:
+        sync_manager.bulk_update_visibility(product_ids, visible=False)
+    else:
+        sync_manager.bulk_delete_products(product_ids)
+
+def send_removal_batch(sync_manager, action, batch):
+    """
+    Send one bulk request; if it fails, send the entries one by one so a single
+    bad product (e.g. already deleted on Wix) cannot hold back the rest
+    Returns (sent, failed) entry lists
+    """
+    try:
+        send_removal(sync_manager, action, [entry["wix_product_id"] for entry in batch])
+        return batch, []
+    except Exception as e:
+        if len(batch) == 1:
+            frappe.log_error(f"Wix {action} failed for {batch[0]['item_code']}: {str(e)}")
+            return [], batch
+
+    sent = []
+    failed = []
+    for entry in batch:
+        entry_sent, entry_failed = send_removal_batch(sync_manager, action, [entry])
+        sent.extend(entry_sent)
+        failed.extend(entry_failed)
+    return sent, failed
+
+def record_removal(sync_manager, entry, status, message, wix_product_id=""):
+    """Log a removal; a failed status write is already logged and must not stop the flush"""
+    try:
+        sync_manager.create_sync_log(entry["item_code"], status, message, wix_product_id)
+    except Exception:
+        pass
+
+def flush_product_removals():
+    """Send queued hides and deletes to Wix in bulk batches"""
+    from zm_frappe_wix_sync.api.wix_sync import WixSyncManager
+
+    # Cleared before flushing: entries pushed from here on queue a new job
+    cache = frappe.cache()
+    cache.delete(cache.make_key(FLUSH_JOB_KEY))
+
+    sync_manager = WixSyncManager(notify=False)
+
+    for action in (ACTION_HIDE, ACTION_DELETE):
+        while True:
+            batch = pop_removal_batch(action)
+            if not batch:
+                break
+
+            sent, failed = send_removal_batch(sync_manager, action, batch)
+
+            for entry in requeue_removal_batch(action, failed):
+                record_removal(sync_manager, entry, "Error",
+                               f"Wix {action} failed {MAX_REMOVAL_ATTEMPTS} times, giving up",
+                               entry["wix_product_id"])
+
+            for entry in sent:
+                if action == ACTION_HIDE:
+                    record_removal(sync_manager, entry, "Success", "Hidden on Wix",
+                                   entry["wix_product_id"])
+                else:
+                    # A success without a product id clears the item's mapping
+                    record_removal(sync_manager, entry, "Success", "Deleted from Wix")
+
+            # Retried entries wait for the next flush instead of spinning here
+            if failed:
+                break
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import time
+from datetime import datetime
+from frappe.utils import cint
+
+# Functions listed per section of the stored profile summary
+DEFAULT_TOP_N = 30
+
+def should_profile(profile=None, settings=None):
+    """An explicit `profile` argument wins, otherwise the Enable Profiling setting"""
+    if profile is not None and profile != "":
+        return bool(cint(profile))
+    return bool(settings and settings.get("enable_profiling"))
+
+class ProfiledRun:
+    """
+    Context manager that profiles a sync run when enabled
+    Records a Wix Sync Run with duration, result counts, SQL query count/time
+    from frappe.db and a top-N summary, and attaches the raw cProfile dump
+    as a private File. Does nothing when disabled.
+    """
+
+    def __init__(self, run_type, enabled=False, settings=None):
+        self.run_type = run_type
+        self.enabled = enabled
+        self.top_n = cint(settings and settings.get("profile_top_n")) or DEFAULT_TOP_N
+        self.run_name = None
+        self.success_count = 0
+        self.error_count = 0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self._profiler = None
+        self._original_sql = None
+        self._started = None
+
+    def set_result(self, success_count=0, error_count=0):
+        self.success_count = success_count
+        self.error_count = error_count
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+
+        run = frappe.get_doc({
+            "doctype": "Wix Sync Run",
+            "run_type": self.run_type,
+            "status": "Running",
+            "started_at": datetime.now()
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+        self.run_name = run.name
+
+        self._instrument_sql()
+        self._started = time.perf_counter()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+
+        self._profiler.disable()
+        duration = time.perf_counter() - self._started
+        self._restore_sql()
+
+        try:
+            self._save(duration, failed=exc_type is not None)
+        except Exception as e:
+            frappe.log_error(f"Failed to save Wix sync profile {self.run_name}: {str(e)}")
+
+        return False
+
+    def _instrument_sql(self):
+        """Count and time every frappe.db.sql call made during the run"""
+        self._had_instance_sql = "sql" in vars(frappe.db)
+        self._original_sql = frappe.db.sql
+        original_sql = self._original_sql
+
+        def timed_sql(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_sql(*args, **kwargs)
+            finally:
+                self.sql_count += 1
+                self.sql_time += time.perf_counter() - start
+
+        frappe.db.sql = timed_sql
+
+    def _restore_sql(self):
+        if self._had_instance_sql:
+            frappe.db.sql = self._original_sql
+        else:
+            del frappe.db.sql
+
+    def _get_summary(self):
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream).strip_dirs()
+        stream.write(f"Top {self.top_n} functions by own time\n")
+        stats.sort_stats("tottime").print_stats(self.top_n)
+        stream.write(f"\nTop {self.top_n} functions by cumulative time\n")
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        return stream.getvalue()
+
+    def _get_dump(self):
+        handle, path = tempfile.mkstemp(suffix=".prof")
+        os.close(handle)
+        try:
+            self._profiler.dump_stats(path)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def _save(self, duration, failed=False):
+        frappe.db.set_value("Wix Sync Run", self.run_name, {
+            "status": "Failed" if failed else "Completed",
+            "finished_at": datetime.now(),
+            "duration": round(duration, 3),
+            "success_count": self.success_count,
+            "error_count": self.error_count,
+            "sql_query_count": self.sql_count,
+            "sql_time": round(self.sql_time, 3),
+            "profile_summary": self._get_summary()
+        })
+
+        frappe.get_doc({
+            "doctype": "File",
+            "file_name": f"{self.run_name}.prof",
+            "attached_to_doctype": "Wix Sync Run",
+            "attached_to_name": self.run_name,
+            "is_private": 1,
+            "content": self._get_dump()
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
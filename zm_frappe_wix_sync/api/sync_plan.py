@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import time
+from frappe.utils import cint
+
+# Wix requests per minute assumed when API Rate Limit is not set
+DEFAULT_RATE_LIMIT = 200
+
+# Operations listed individually in a plan; the counts cover everything
+PLAN_SAMPLE_SIZE = 100
+
+def plan_sync_items(sync_manager, items, force=False):
+    """
+    Work out what syncing `items` would do without sending anything to Wix
+    Payloads, mappings and payload hashes are resolved exactly as a real run
+    resolves them, batch by batch; images not yet on Wix are counted as uploads
+    """
+    from zm_frappe_wix_sync.api.wix_sync import ITEM_PAGE_SIZE, iter_chunks
+
+    if not sync_manager.dry_run:
+        raise Exception("Sync plans need a WixSyncManager created with dry_run=True")
+
+    started = time.perf_counter()
+    counts = {"create": 0, "update": 0, "skip": 0, "error": 0}
+    operations = []
+    planned = set()
+
+    for chunk in iter_chunks(items, ITEM_PAGE_SIZE):
+        sync_manager.prefetch_item_data(chunk)
+
+        for item in chunk:
+            try:
+                operation = sync_manager.prepare_sync_operation(item, force)
+            except Exception as e:
+                counts["error"] += 1
+                add_plan_operation(operations, item.item_code, "error", message=str(e))
+                continue
+
+            # Variants of one template collapse into a single request
+            target = operation["item"]
+            if target.name in planned:
+                continue
+            planned.add(target.name)
+
+            counts[operation["action"]] += 1
+            if operation["action"] != "skip":
+                add_plan_operation(operations, target.item_code, operation["action"],
+                                   operation["product_id"])
+
+    media_requests = sum(sync_manager.planned_media_uploads.values())
+    request_count = counts["create"] + counts["update"] + media_requests
+    rate_limit = cint((sync_manager.settings or {}).get("api_rate_limit")) or DEFAULT_RATE_LIMIT
+
+    return {
+        "dry_run": True,
+        "creates": counts["create"],
+        "updates": counts["update"],
+        "skips": counts["skip"],
+        "errors": counts["error"],
+        "media_uploads": len(sync_manager.planned_media_uploads),
+        "estimated_requests": request_count,
+        "rate_limit": rate_limit,
+        "estimated_duration": round(request_count * 60.0 / rate_limit, 1),
+        "planning_time": round(time.perf_counter() - started, 2),
+        "operations": operations
+    }
+
+def add_plan_operation(operations, item_code, action, product_id=None, message=""):
+    """Keep the first PLAN_SAMPLE_SIZE operations for display"""
+    if len(operations) < PLAN_SAMPLE_SIZE:
+        operations.append({
+            "item_code": item_code,
+            "action": action,
+            "product_id": product_id,
+            "message": message
+        })
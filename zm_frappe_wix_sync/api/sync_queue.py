@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import json
+import time
+from datetime import datetime, timezone
+
+# Sync work is tagged with a priority and routed to its own RQ queue so that
+# interactive syncs (Item saves, small list selections) never wait behind a
+# full-catalog backfill.
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"
+
+SYNC_QUEUES = {
+    PRIORITY_HIGH: "short",
+    PRIORITY_LOW: "long"
+}
+
+# Roles allowed to start syncs and imports or read sync health from the API
+SYNC_ROLES = ("System Manager", "Item Manager")
+
+# List view selections up to this size are treated as interactive
+INTERACTIVE_BATCH_LIMIT = 20
+
+# Bulk runs stop to sync waiting high-priority items after this many items
+PRIORITY_CHECK_INTERVAL = 50
+
+# Redis list of pending high-priority item codes and recent wait samples
+PRIORITY_ITEMS_KEY = "wix_sync:priority_items"
+WAIT_TIMES_KEY = "wix_sync:wait_times:{0}"
+WAIT_SAMPLE_SIZE = 100
+
+# Set while a priority drain job is queued, so a burst of saves queues one job.
+# Expires in case the job is lost with its worker.
+PRIORITY_JOB_KEY = "wix_sync:priority_job_pending"
+PRIORITY_JOB_TTL = 3600
+
+# Items popped and synced at a time, so a killed job loses at most one batch
+PRIORITY_DRAIN_BATCH = 50
+
+# A drain job stops taking new batches after this many seconds and hands the
+# rest to a follow-up job, well inside its RQ timeout
+PRIORITY_JOB_BUDGET = 240
+PRIORITY_JOB_TIMEOUT = 600
+
+def get_queue_for(priority):
+    """RQ queue name for a sync priority"""
+    return SYNC_QUEUES.get(priority, SYNC_QUEUES[PRIORITY_LOW])
+
+def get_priority_for_batch(size):
+    """Small selections are interactive, anything larger is a bulk job"""
+    return PRIORITY_HIGH if size <= INTERACTIVE_BATCH_LIMIT else PRIORITY_LOW
+
+def enqueue_priority_sync(item_code):
+    """
+    Queue a high-priority sync for one item once the current transaction commits
+    The item code goes on a Redis list so running bulk jobs can pick it up too
+    """
+    def push():
+        cache = frappe.cache()
+        entry = json.dumps({"item_code": item_code, "queued_at": time.time()})
+        cache.rpush(PRIORITY_ITEMS_KEY, entry)
+
+        # Only the first push since the last drain started queues a job
+        queue_priority_job()
+
+    frappe.db.after_commit.add(push)
+
+def queue_priority_job():
+    """Queue a drain job unless one is already pending"""
+    cache = frappe.cache()
+    if cache.set(cache.make_key(PRIORITY_JOB_KEY), 1, nx=True, ex=PRIORITY_JOB_TTL):
+        frappe.enqueue(
+            "zm_frappe_wix_sync.api.sync_queue.process_priority_queue",
+            queue=get_queue_for(PRIORITY_HIGH),
+            timeout=PRIORITY_JOB_TIMEOUT
+        )
+
+def process_priority_queue():
+    """Short-queue job - sync pending high-priority items in bounded batches"""
+    # Cleared before draining: items pushed from here on queue a new job
+    cache = frappe.cache()
+    cache.delete(cache.make_key(PRIORITY_JOB_KEY))
+
+    started = time.time()
+    while drain_priority_items():
+        if time.time() - started > PRIORITY_JOB_BUDGET:
+            # Leave the rest to a fresh job instead of running into the timeout
+            if cache.llen(PRIORITY_ITEMS_KEY):
+                queue_priority_job()
+            break
+
+def drain_priority_items(limit=PRIORITY_DRAIN_BATCH):
+    """
+    Sync up to `limit` pending high-priority items and return their item codes
+    Called by the short-queue job and by bulk runs between chunks. A fresh
+    manager is used so no batch caches of a running bulk sync leak into it
+    """
+    from zm_frappe_wix_sync.api.wix_sync import WixSyncManager, iter_items_by_code
+
+    cache = frappe.cache()
+    item_codes = []
+
+    while len(item_codes) < limit:
+        entry = cache.lpop(PRIORITY_ITEMS_KEY)
+        if not entry:
+            break
+        entry = json.loads(entry)
+        record_queue_wait(PRIORITY_HIGH, entry.get("queued_at"))
+        item_codes.append(entry.get("item_code"))
+
+    # Several saves of the same item collapse into one sync
+    item_codes = list(dict.fromkeys(code for code in item_codes if code))
+    if not item_codes:
+        return set()
+
+    sync_manager = WixSyncManager(notify=False)
+    for item_code, item in iter_items_by_code(item_codes):
+        if not item:
+            continue
+        try:
+            sync_manager.sync_item_to_wix(item)
+        except Exception as e:
+            frappe.log_error(f"Priority sync failed for {item_code}: {str(e)}")
+
+    return set(item_codes)
+
+def record_queue_wait(priority, queued_at):
+    """Keep a rolling sample of how long work waited before it started"""
+    if not queued_at:
+        return
+
+    key = WAIT_TIMES_KEY.format(priority)
+    cache = frappe.cache()
+    cache.lpush(key, max(0.0, time.time() - float(queued_at)))
+    cache.ltrim(key, 0, WAIT_SAMPLE_SIZE - 1)
+
+def get_oldest_job_wait(queue):
+    """Seconds the oldest job in an RQ queue has been waiting"""
+    jobs = queue.get_jobs(0, 1)
+    if not jobs or not jobs[0].enqueued_at:
+        return 0.0
+
+    enqueued_at = jobs[0].enqueued_at
+    # Newer RQ versions store timezone-aware timestamps
+    now = datetime.now(timezone.utc) if enqueued_at.tzinfo else datetime.utcnow()
+    return max(0.0, (now - enqueued_at).total_seconds())
+
+@frappe.whitelist()
+def get_sync_queue_status():
+    """Queue depth and wait times for each sync priority"""
+    from frappe.utils.background_jobs import get_queue
+
+    frappe.only_for(SYNC_ROLES)
+
+    cache = frappe.cache()
+    status = {
+        "pending_priority_items": cache.llen(PRIORITY_ITEMS_KEY) or 0
+    }
+
+    for priority, queue_name in SYNC_QUEUES.items():
+        waits = [float(w) for w in cache.lrange(WAIT_TIMES_KEY.format(priority), 0, -1)]
+
+        try:
+            queue = get_queue(queue_name)
+            queued_jobs = queue.count
+            oldest_job_wait = get_oldest_job_wait(queue)
+        except Exception as e:
+            frappe.log_error(f"Could not read {queue_name} queue status: {str(e)}")
+            queued_jobs = 0
+            oldest_job_wait = 0.0
+
+        status[priority] = {
+            "queue": queue_name,
+            "queued_jobs": queued_jobs,
+            "oldest_job_wait": round(oldest_job_wait, 1),
+            "avg_wait": round(sum(waits) / len(waits), 1) if waits else 0.0,
+            "max_wait": round(max(waits), 1) if waits else 0.0
+        }
+
+    return status
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import frappe
+import json
+from datetime import datetime
+from zm_frappe_wix_sync.api.sync_queue import SYNC_ROLES
+
+# Global counters kept in Wix Sync Counter, one row each
+COUNTERS = (
+    "total_attempts",
+    "total_success",
+    "total_errors",
+    "items_tracked",
+    "items_success",
+    "items_error"
+)
+
+# Failing items listed on the dashboard
+DASHBOARD_ERROR_LIMIT = 10
+
+def record_sync_outcome(item_code, status, error_message="", wix_product_id="", sync_datetime=None,
+                        payload_hash=None):
+    """
+    Fold one sync outcome into Wix Sync Status and the global counters
+    Called for every Wix Sync Log entry, inside the same transaction.
+    A success stores the hash of the payload pushed, or clears it when none is given
+    """
+    sync_datetime = sync_datetime or datetime.now()
+    is_success = status == "Success"
+    previous = frappe.db.get_value("Wix Sync Status", item_code, ["name", "current_status"], as_dict=True)
+
+    deltas = {
+        "total_attempts": 1,
+        "total_success" if is_success else "total_errors": 1
+    }
+
+    if not previous:
+        try:
+            frappe.get_doc({
+                "doctype": "Wix Sync Status",
+                "item_code": item_code,
+                "current_status": status,
+                "wix_product_id": wix_product_id if is_success else "",
+                "payload_hash": (payload_hash or "") if is_success else "",
+                "attempt_count": 1,
+                "last_attempt": sync_datetime,
+                "last_success": sync_datetime if is_success else None,
+                "last_error": None if is_success else sync_datetime,
+                "last_error_message": "" if is_success else error_message
+            }).insert(ignore_permissions=True, ignore_links=True)
+            deltas["items_tracked"] = 1
+        except frappe.DuplicateEntryError:
+            # Another worker created the row first - treat it as an update
+            previous = frappe.db.get_value("Wix Sync Status", item_code,
+                                           ["name", "current_status"], as_dict=True)
+
+    if previous:
+        values = {
+            "item_code": item_code,
+            "status": status,
+            "sync_datetime": sync_datetime,
+            "wix_product_id": wix_product_id,
+            "payload_hash": payload_hash or "",
+            "error_message": error_message
+        }
+        if is_success:
+            frappe.db.sql("""
+                UPDATE `tabWix Sync Status`
+                SET current_status = %(status)s,
+                    attempt_count = attempt_count + 1,
+                    last_attempt = %(sync_datetime)s,
+                    last_success = %(sync_datetime)s,
+                    wix_product_id = %(wix_product_id)s,
+                    payload_hash = %(payload_hash)s,
+                    modified = %(sync_datetime)s
+                WHERE name = %(item_code)s
+            """, values)
+        else:
+            frappe.db.sql("""
+                UPDATE `tabWix Sync Status`
+                SET current_status = %(status)s,
+                    attempt_count = attempt_count + 1,
+                    last_attempt = %(sync_datetime)s,
+                    last_error = %(sync_datetime)s,
+                    last_error_message = %(error_message)s,
+                    modified = %(sync_datetime)s
+                WHERE name = %(item_code)s
+            """, values)
+
+    previous_status = previous.current_status if previous else None
+    if previous_status != status:
+        deltas[get_item_counter(status)] = 1
+        if previous_status:
+            deltas[get_item_counter(previous_status)] = -1
+
+    increment_counters(deltas)
+
+def record_variant_ids(item_code, product):
+    """
+    Remember which Wix variant belongs to which Item, keyed by the variant SKU
+    Lets order import resolve a variant line to the variant rather than its template
+    """
+    variants = ((product or {}).get("variantsInfo") or {}).get("variants") or []
+    variant_ids = {v["id"]: v["sku"] for v in variants if v.get("id") and v.get("sku")}
+    if variant_ids:
+        frappe.db.set_value("Wix Sync Status", item_code, "wix_variant_ids",
+                            json.dumps(variant_ids), update_modified=False)
+
+def get_item_counter(status):
+    return "items_success" if status == "Success" else "items_error"
+
+def increment_counters(deltas):
+    """Atomically add to global counters, creating missing rows"""
+    now = datetime.now()
+    for counter, delta in deltas.items():
+        if not delta:
+            continue
+        frappe.db.sql("""
+            INSERT INTO `tabWix Sync Counter`
+                (name, counter, counter_value, creation, modified, owner, modified_by, docstatus, idx)
+            VALUES (%(counter)s, %(counter)s, %(delta)s, %(now)s, %(now)s, 'Administrator', 'Administrator', 0, 0)
+            ON DUPLICATE KEY UPDATE counter_value = counter_value + %(delta)s, modified = %(now)s
+        """, {"counter": counter, "delta": delta, "now": now})
+
+def set_counters(values):
+    """Overwrite global counters, e.g. after a rebuild"""
+    now = datetime.now()
+    for counter, value in values.items():
+        frappe.db.sql("""
+            INSERT INTO `tabWix Sync Counter`
+                (name, counter, counter_value, creation, modified, owner, modified_by, docstatus, idx)
+            VALUES (%(counter)s, %(counter)s, %(value)s, %(now)s, %(now)s, 'Administrator', 'Administrator', 0, 0)
+            ON DUPLICATE KEY UPDATE counter_value = %(value)s, modified = %(now)s
+        """, {"counter": counter, "value": value, "now": now})
+
+def get_sync_counters():
+    counters = {counter: 0 for counter in COUNTERS}
+    for row in frappe.get_all("Wix Sync Counter", fields=["name", "counter_value"]):
+        counters[row.name] = row.counter_value or 0
+    return counters
+
+def rebuild_sync_counters():
+    """Recompute global counters from Wix Sync Status and Wix Sync Log"""
+    items = frappe.db.sql("""
+        SELECT current_status, COUNT(*) AS item_count, SUM(attempt_count) AS attempts
+        FROM `tabWix Sync Status`
+        GROUP BY current_status
+    """, as_dict=True)
+    logs = dict(frappe.db.sql("""
+        SELECT sync_status = 'Success', COUNT(*)
+        FROM `tabWix Sync Log`
+        GROUP BY sync_status = 'Success'
+    """))
+
+    counters = {counter: 0 for counter in COUNTERS}
+    for row in items:
+        counters["items_tracked"] += row.item_count
+        counters["total_attempts"] += int(row.attempts or 0)
+        counters[get_item_counter(row.current_status)] += row.item_count
+    counters["total_success"] = logs.get(1, 0)
+    counters["total_errors"] = logs.get(0, 0)
+
+    set_counters(counters)
+    return counters
+
+@frappe.whitelist()
+def get_sync_dashboard():
+    """Sync health from the materialized summary - no scans over Wix Sync Log"""
+    frappe.only_for(SYNC_ROLES)
+    return {
+        "counters": get_sync_counters(),
+        "recent_errors": frappe.get_all("Wix Sync Status",
+                                        filters={"current_status": "Error"},
+                                        fields=["item_code", "last_error", "attempt_count", "last_error_message"],
+                                        order_by="last_error desc",
+                                        limit=DASHBOARD_ERROR_LIMIT)
+    }
@@ -2,17 +2,86 @@
 from __future__ import unicode_literals
 import frappe
 import requests
+import hashlib
 import json
+import time
 from datetime import datetime
-from frappe.utils import cstr
+from frappe.utils import cint, cstr
+from zm_frappe_wix_sync.api.async_transport import send_operations
+from zm_frappe_wix_sync.api.category_sync import sync_wix_categories
+from zm_frappe_wix_sync.api.connection_health import get_connection_health
+from zm_frappe_wix_sync.api.media_sync import get_item_media_ids, get_media_id_map
+from zm_frappe_wix_sync.api.order_import import import_wix_orders
+from zm_frappe_wix_sync.api.profiling import ProfiledRun, should_profile
+from zm_frappe_wix_sync.api.product_removal import (
+    ACTION_DELETE,
+    ACTION_HIDE,
+    queue_product_removal
+)
+from zm_frappe_wix_sync.api.sync_plan import DEFAULT_RATE_LIMIT, plan_sync_items
+from zm_frappe_wix_sync.api.sync_status import (
+    rebuild_sync_counters,
+    record_sync_outcome,
+    record_variant_ids
+)
+from zm_frappe_wix_sync.api.sync_queue import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_CHECK_INTERVAL,
+    SYNC_ROLES,
+    drain_priority_items,
+    enqueue_priority_sync,
+    get_priority_for_batch,
+    get_queue_for,
+    record_queue_wait
+)
+
+# Item columns read by the product payload builder. Bulk syncs select only
+# these instead of loading full Item documents with their child tables.
+ITEM_SYNC_FIELDS = (
+    "name",
+    "item_code",
+    "item_name",
+    "description",
+    "brand",
+    "weight_per_unit",
+    "standard_rate",
+    "is_sales_item",
+    "disabled",
+    "has_variants",
+    "variant_of",
+    "image"
+)
+
+# Rows fetched per keyset page during full and scheduled syncs
+ITEM_PAGE_SIZE = 500
+
+# Items prepared and sent together when the async transport is used
+ASYNC_BATCH_SIZE = 200
+
+# Product fields only sent on create, left out of the payload hash so a
+# create and the updates after it hash alike
+CREATE_ONLY_FIELDS = ("productType", "ribbon", "brand")
 
 class WixSyncManager:
-    def __init__(self):
+    def __init__(self, notify=True, dry_run=False):
+        # Bulk runs pass notify=False so msgprint does not pile up a message per item
+        self.notify = notify
+        # Dry runs build payloads but never call Wix; uploads they would make are noted here
+        self.dry_run = dry_run
+        self.planned_media_uploads = {}
         self.settings = self.get_sync_settings()
         self.api_key = self.settings.get('wix_api_key')
         # Updated with correct site ID found during troubleshooting
         self.site_id = self.settings.get('wix_site_id', '63a7b738-6d1c-447a-849a-fab973366a06')
         self.base_url = "https://www.wixapis.com"
+        self._currency = None
+        # Stock, prices, sync state and media for the batch being synced, filled by prefetch_item_data
+        self._stock_cache = {}
+        self._price_cache = {}
+        self._sync_state_cache = {}
+        self._media_cache = {}
+        self._stock_scope = None
         
     def get_sync_settings(self):
         """Get Wix sync settings - updated to handle new document structure"""
@@ -42,120 +111,525 @@ class WixSyncManager:
             'wix-site-id': self.site_id
         }
     
-    def sync_item_to_wix(self, item_doc):
+    def sync_item_to_wix(self, item_doc, force=False):
         """
         Sync a single Frappe item to Wix Store
         Updated with proper error handling and authentication
         """
         try:
-            # Check if item already synced
-            existing_sync = self.get_existing_sync_log(item_doc.item_code)
+            operation = self.prepare_sync_operation(item_doc, force)
+            item_doc = operation["item"]
             
-            if existing_sync and existing_sync.get('sync_status') == 'Success':
+            if operation["action"] == "skip":
+                # Nothing changed since the last push
+                return True
+            elif operation["action"] == "update":
                 # Update existing product
-                return self.update_wix_product(item_doc, existing_sync.get('wix_product_id'))
+                return self.update_wix_product(item_doc, operation["product_id"], operation["payload"])
             else:
                 # Create new product
-                return self.create_wix_product(item_doc)
+                return self.create_wix_product(item_doc, operation["payload"])
                 
         except Exception as e:
             self.create_sync_log(item_doc.item_code, "Error", str(e))
             frappe.log_error(f"Wix sync failed for {item_doc.item_code}: {str(e)}")
             return False
     
-    def create_wix_product(self, item_doc):
-        """Create new product in Wix - updated API endpoint and structure"""
-        url = f"{self.base_url}/stores-catalog/v3/products"
+    def prepare_sync_operation(self, item_doc, force=False):
+        """
+        Work out what syncing an Item sends - create, update or skip, target product and payload
+        All database reads happen here, so the request can go over any transport.
+        An update whose payload matches the last one pushed is skipped unless forced
+        """
+        # Variants are pushed as part of their template's Wix product
+        if getattr(item_doc, 'variant_of', None):
+            template = self.get_item_row(item_doc.variant_of)
+            if not template:
+                raise Exception(f"Variant template {item_doc.variant_of} not found")
+            item_doc = template
         
-        # Prepare product data according to working Catalog V3 format
-        product_data = {
-            "product": {
-                "name": item_doc.item_name or item_doc.item_code,
-                "description": item_doc.description or f"Product: {item_doc.item_name}",
-                "visible": True,
+        # Check if item already synced
+        sync_state = self.get_sync_state(item_doc.item_code)
+        
+        if sync_state and sync_state.wix_product_id:
+            payload = self.build_product_data(item_doc, is_update=True)
+            payload_hash = get_payload_hash(payload)
+            unchanged = not force and payload_hash == sync_state.payload_hash
+            return {
+                "item": item_doc,
+                "action": "skip" if unchanged else "update",
+                "product_id": sync_state.wix_product_id,
+                "payload": payload,
+                "payload_hash": payload_hash
+            }
+        
+        payload = self.build_product_data(item_doc)
+        return {
+            "item": item_doc,
+            "action": "create",
+            "product_id": None,
+            "payload": payload,
+            "payload_hash": get_payload_hash(payload)
+        }
+    
+    def record_sync_result(self, operation, status_code, response_text):
+        """Log the outcome of a create/update request, whichever transport sent it"""
+        if operation["action"] == "update":
+            return self.record_update_result(operation["item"], operation["product_id"], status_code,
+                                             response_text, operation["payload_hash"])
+        return self.record_create_result(operation["item"], status_code, response_text,
+                                         operation["payload_hash"])
+    
+    def build_product_data(self, item_doc, is_update=False):
+        """
+        Build the Catalog V3 product payload for an Item
+        Works with full Item documents and with rows selected via ITEM_SYNC_FIELDS
+        """
+        product = {
+            "name": item_doc.item_name or item_doc.item_code,
+            "description": item_doc.description or f"Product: {item_doc.item_name}",
+            "sku": item_doc.item_code,
+            # Sent on updates too so re-enabling an Item shows it again
+            "visible": self.is_item_visible(item_doc),
+            "weight": self.get_item_weight(item_doc),
+            "stock": {
+                "trackingEnabled": True,
+                "quantity": self.get_item_stock_qty(item_doc)
+            },
+            "priceData": {
+                "price": self.get_item_price(item_doc),
+                "currency": self.get_currency()
+            }
+        }
+        
+        # Templates carry their variants as Wix options in the same request
+        if getattr(item_doc, 'has_variants', 0):
+            variants = self.get_item_variants(item_doc.item_code)
+            if variants:
+                product.update(self.build_variant_data(variants))
+        
+        # Images already on Wix are referenced by media id, never re-uploaded
+        if self.settings and self.settings.get("sync_product_images"):
+            media_ids = get_item_media_ids(self, item_doc)
+            if media_ids:
+                product["media"] = {
+                    "itemsInfo": {"items": [{"id": media_id} for media_id in media_ids]}
+                }
+        
+        if not is_update:
+            product.update({
                 "productType": "physical",
                 "ribbon": "",
-                "brand": getattr(item_doc, 'brand', '') or "",
-                "sku": item_doc.item_code,
-                "weight": self.get_item_weight(item_doc),
+                "brand": getattr(item_doc, 'brand', '') or ""
+            })
+        
+        return {"product": product}
+    
+    def is_item_visible(self, item_doc):
+        """Only enabled sales items are visible on the storefront"""
+        return bool(getattr(item_doc, 'is_sales_item', 1)) and not getattr(item_doc, 'disabled', 0)
+    
+    def build_variant_data(self, variants):
+        """
+        Build options and per-variant price/stock for a template's variants
+        Product level stock is the variant total and price the lowest variant price
+        """
+        options = {}
+        variant_data = []
+        
+        for variant in variants:
+            choices = []
+            for attribute in variant.attributes:
+                choice_name = cstr(attribute.attribute_value)
+                values = options.setdefault(attribute.attribute, [])
+                if choice_name not in values:
+                    values.append(choice_name)
+                choices.append({
+                    "optionChoiceNames": {
+                        "optionName": attribute.attribute,
+                        "choiceName": choice_name
+                    }
+                })
+            
+            variant_data.append({
+                "sku": variant.item_code,
+                "choices": choices,
+                "weight": self.get_item_weight(variant),
                 "stock": {
                     "trackingEnabled": True,
-                    "quantity": self.get_item_stock_qty(item_doc)
+                    "quantity": self.get_item_stock_qty(variant)
                 },
                 "priceData": {
-                    "price": self.get_item_price(item_doc),
-                    "currency": frappe.defaults.get_defaults().get('currency', 'USD')
+                    "price": self.get_item_price(variant)
                 }
+            })
+        
+        return {
+            "options": [
+                {
+                    "name": attribute,
+                    "choicesSettings": {
+                        "choices": [{"name": value} for value in values]
+                    }
+                }
+                for attribute, values in options.items()
+            ],
+            "variantsInfo": {"variants": variant_data},
+            "stock": {
+                "trackingEnabled": True,
+                "quantity": sum(v["stock"]["quantity"] for v in variant_data)
+            },
+            "priceData": {
+                "price": min(v["priceData"]["price"] for v in variant_data),
+                "currency": self.get_currency()
             }
         }
+    
+    def get_item_row(self, item_code):
+        """Fetch one Item as a row of ITEM_SYNC_FIELDS"""
+        return frappe.db.get_value("Item", item_code, list(ITEM_SYNC_FIELDS), as_dict=True)
+    
+    def get_item_variants(self, template_code):
+        """
+        Enabled sales variants of a template with their attribute values attached
+        Attributes are ordered as on the template so Wix options keep that order
+        """
+        variants = frappe.get_all("Item",
+                                  filters={"variant_of": template_code, "disabled": 0, "is_sales_item": 1},
+                                  fields=list(ITEM_SYNC_FIELDS),
+                                  order_by="name")
+        if not variants:
+            return []
         
-        response = requests.post(url, headers=self.get_headers(), json=product_data, timeout=30)
+        self._stock_cache.update(self.get_stock_qty_map([v.name for v in variants]))
+        self._price_cache.update(self.get_item_price_map([v.name for v in variants]))
+        
+        attributes = frappe.get_all("Item Variant Attribute",
+                                    filters={
+                                        "parenttype": "Item",
+                                        "parent": ["in", [template_code] + [v.name for v in variants]]
+                                    },
+                                    fields=["parent", "attribute", "attribute_value", "idx"])
+        
+        template_order = {a.attribute: a.idx for a in attributes if a.parent == template_code}
+        attributes_by_variant = {}
+        for attribute in attributes:
+            if attribute.parent != template_code:
+                attributes_by_variant.setdefault(attribute.parent, []).append(attribute)
+        
+        for variant in variants:
+            variant.attributes = sorted(attributes_by_variant.get(variant.name, []),
+                                        key=lambda a: (template_order.get(a.attribute, a.idx), a.idx))
+        
+        return variants
+    
+    def get_currency(self):
+        """Default currency, looked up once per manager"""
+        if not self._currency:
+            self._currency = frappe.defaults.get_defaults().get('currency', 'USD')
+        return self._currency
+    
+    def create_wix_product(self, item_doc, product_data=None):
+        """Create new product in Wix - updated API endpoint and structure"""
+        url = f"{self.base_url}/stores-catalog/v3/products"
         
-        if response.status_code in [200, 201]:
-            result = response.json()
+        # Prepare product data according to working Catalog V3 format
+        if product_data is None:
+            product_data = self.build_product_data(item_doc)
+        
+        response = requests.post(url, headers=self.get_headers(), json=product_data, timeout=30)
+        return self.record_create_result(item_doc, response.status_code, response.text,
+                                         get_payload_hash(product_data))
+    
+    def record_create_result(self, item_doc, status_code, response_text, payload_hash=None):
+        """Log a product create response and store the new product id"""
+        if status_code in [200, 201]:
+            result = json.loads(response_text or "{}")
             wix_product_id = result.get('product', {}).get('id', '')
-            self.create_sync_log(item_doc.item_code, "Success", "", wix_product_id)
+            self.create_sync_log(item_doc.item_code, "Success", "", wix_product_id, payload_hash)
+            if getattr(item_doc, 'has_variants', 0):
+                self.retire_variant_products(item_doc.item_code)
+            self.store_variant_ids(item_doc.item_code, response_text)
             
             # Update Frappe item with Wix product ID
             self.update_item_with_wix_id(item_doc.name, wix_product_id)
             
-            frappe.msgprint(f"✅ Successfully synced {item_doc.item_name} to Wix!")
+            if self.notify:
+                frappe.msgprint(f"✅ Successfully synced {item_doc.item_name} to Wix!")
             return True
         else:
-            error_msg = f"API Error {response.status_code}: {response.text}"
+            error_msg = f"API Error {status_code}: {response_text}"
             self.create_sync_log(item_doc.item_code, "Error", error_msg)
-            frappe.msgprint(f"Failed to sync {item_doc.item_name}: {error_msg}", alert=True, indicator="red")
+            if self.notify:
+                frappe.msgprint(f"Failed to sync {item_doc.item_name}: {error_msg}", alert=True, indicator="red")
             return False
     
-    def update_wix_product(self, item_doc, wix_product_id):
+    def update_wix_product(self, item_doc, wix_product_id, update_data=None):
         """Update existing product in Wix"""
         url = f"{self.base_url}/stores-catalog/v3/products/{wix_product_id}"
         
         # Prepare update data
-        update_data = {
-            "product": {
-                "name": item_doc.item_name or item_doc.item_code,
-                "description": item_doc.description or f"Product: {item_doc.item_name}",
-                "sku": item_doc.item_code,
-                "weight": self.get_item_weight(item_doc),
-                "stock": {
-                    "trackingEnabled": True,
-                    "quantity": self.get_item_stock_qty(item_doc)
-                },
-                "priceData": {
-                    "price": self.get_item_price(item_doc),
-                    "currency": frappe.defaults.get_defaults().get('currency', 'USD')
-                }
-            }
-        }
+        if update_data is None:
+            update_data = self.build_product_data(item_doc, is_update=True)
         
         response = requests.patch(url, headers=self.get_headers(), json=update_data, timeout=30)
-        
-        if response.status_code == 200:
-            self.create_sync_log(item_doc.item_code, "Success", "Updated", wix_product_id)
-            frappe.msgprint(f"✅ Successfully updated {item_doc.item_name} in Wix!")
+        return self.record_update_result(item_doc, wix_product_id, response.status_code, response.text,
+                                         get_payload_hash(update_data))
+    
+    def record_update_result(self, item_doc, wix_product_id, status_code, response_text, payload_hash=None):
+        """Log a product update response"""
+        if status_code == 200:
+            self.create_sync_log(item_doc.item_code, "Success", "Updated", wix_product_id, payload_hash)
+            if getattr(item_doc, 'has_variants', 0):
+                # Templates synced before variant support already have a product
+                self.retire_variant_products(item_doc.item_code)
+            self.store_variant_ids(item_doc.item_code, response_text)
+            if self.notify:
+                frappe.msgprint(f"✅ Successfully updated {item_doc.item_name} in Wix!")
             return True
         else:
-            error_msg = f"Update Error {response.status_code}: {response.text}"
+            error_msg = f"Update Error {status_code}: {response_text}"
             self.create_sync_log(item_doc.item_code, "Error", error_msg)
             return False
     
+    def retire_variant_products(self, template_code):
+        """
+        Delete Wix products left from syncing variants on their own
+        They now live inside the template's product and would be listed twice
+        """
+        rows = frappe.db.sql("""
+            SELECT s.name, s.wix_product_id
+            FROM `tabWix Sync Status` s
+            INNER JOIN `tabItem` i ON i.name = s.name
+            WHERE i.variant_of = %(template)s
+            AND IFNULL(s.wix_product_id, '') != ''
+        """, {"template": template_code}, as_dict=True)
+        
+        for row in rows:
+            # Flushed in bulk once the template's product is committed
+            queue_product_removal(row.name, row.wix_product_id, ACTION_DELETE)
+    
+    def store_variant_ids(self, item_code, response_text):
+        """Keep the Wix variant ids of a pushed product for order import"""
+        try:
+            record_variant_ids(item_code, json.loads(response_text or "{}").get('product'))
+            frappe.db.commit()
+        except Exception as e:
+            frappe.log_error(f"Failed to store Wix variant ids for {item_code}: {str(e)}")
+    
+    def bulk_update_visibility(self, product_ids, visible):
+        """Show or hide many Wix products in one request"""
+        url = f"{self.base_url}/stores-catalog/v3/bulk/products/update-by-filter"
+        payload = {
+            "filter": {"id": {"$in": list(product_ids)}},
+            "product": {"visible": visible}
+        }
+        
+        response = requests.post(url, headers=self.get_headers(), json=payload, timeout=30)
+        if response.status_code != 200:
+            raise Exception(f"Bulk visibility update error {response.status_code}: {response.text}")
+        return response.json()
+    
+    def bulk_delete_products(self, product_ids):
+        """Delete many Wix products in one request"""
+        url = f"{self.base_url}/stores-catalog/v3/bulk/products/delete"
+        
+        response = requests.post(url, headers=self.get_headers(),
+                                 json={"productIds": list(product_ids)}, timeout=30)
+        if response.status_code != 200:
+            raise Exception(f"Bulk delete error {response.status_code}: {response.text}")
+        return response.json()
+    
+    def sync_items(self, items, force=False):
+        """
+        Sync an iterable of Item rows and return (success_count, error_count)
+        Rows are consumed one at a time so generators keep memory flat; every
+        PRIORITY_CHECK_INTERVAL items the run yields to waiting high-priority syncs.
+        With force, unchanged products are pushed too
+        """
+        if self.use_async_transport():
+            return self.sync_items_async(items, force=force)
+        
+        success_count = 0
+        error_count = 0
+        processed = 0
+        # Items an interactive sync pushed during this run; our rows for them are stale
+        drained = set()
+        
+        # Buffer one page at a time so per-batch lookups cost one query each
+        for chunk in iter_chunks(items, ITEM_PAGE_SIZE):
+            self.prefetch_item_data(chunk)
+            
+            for item in chunk:
+                processed += 1
+                if processed % PRIORITY_CHECK_INTERVAL == 0:
+                    drained |= drain_priority_items()
+                
+                if item.item_code in drained:
+                    success_count += 1
+                    continue
+                
+                try:
+                    if self.sync_item_to_wix(item, force):
+                        success_count += 1
+                    else:
+                        error_count += 1
+                except Exception as e:
+                    error_count += 1
+                    frappe.log_error(f"Bulk sync failed for {item.item_code}: {str(e)}")
+        
+        return success_count, error_count
+    
+    def prefetch_item_data(self, items):
+        """Load stock, prices, sync state and media for a whole batch up front, replacing the previous batch"""
+        item_codes = [item.item_code for item in items]
+        self._stock_cache = self.get_stock_qty_map(item_codes)
+        self._price_cache = self.get_item_price_map(item_codes)
+        self._sync_state_cache = self.get_sync_state_map(item_codes)
+        
+        # Variants carry no media of their own - their template's product does
+        self._media_cache = {}
+        if self.settings and self.settings.get("sync_product_images"):
+            self._media_cache = get_media_id_map(self, [item for item in items
+                                                        if not getattr(item, 'variant_of', None)])
+    
+    def plan_sync(self, items, force=False):
+        """Operation plan and request budget for syncing `items`, without calling Wix"""
+        return plan_sync_items(self, items, force)
+    
+    def profiled_run(self, run_type, profile=None):
+        """
+        Context manager that profiles the enclosed run when `profile` is set,
+        or when Enable Profiling is on and `profile` is not given
+        """
+        return ProfiledRun(run_type, should_profile(profile, self.settings), self.settings)
+    
+    def use_async_transport(self):
+        """Whether bulk syncs go over the asyncio transport"""
+        return bool(self.settings) and self.settings.get("http_transport") == "Async"
+    
+    def sync_items_async(self, items, batch_size=ASYNC_BATCH_SIZE, force=False):
+        """
+        Sync Item rows over the async transport, batch by batch
+        Payloads are prepared and results recorded here, on the database side;
+        only the HTTP requests of a batch run concurrently
+        """
+        success_count = 0
+        error_count = 0
+        batch = []
+        # Items an interactive sync pushed during this run; our rows for them are stale
+        drained = set()
+        
+        for item in items:
+            if item.item_code in drained:
+                success_count += 1
+                continue
+            
+            batch.append(item)
+            if len(batch) < batch_size:
+                continue
+            
+            batch_success, batch_errors = self.send_batch_async(batch, force)
+            success_count += batch_success
+            error_count += batch_errors
+            batch = []
+            drained |= drain_priority_items()
+        
+        if batch:
+            batch_success, batch_errors = self.send_batch_async(batch, force)
+            success_count += batch_success
+            error_count += batch_errors
+        
+        return success_count, error_count
+    
+    def send_batch_async(self, items, force=False):
+        """Prepare, send concurrently and record one batch; returns (success_count, error_count)"""
+        success_count = 0
+        error_count = 0
+        operations = {}
+        self.prefetch_item_data(items)
+        
+        for item in items:
+            try:
+                operation = self.prepare_sync_operation(item, force)
+                # Variants of one template collapse into a single request
+                operations.setdefault(operation["item"].name, operation)
+            except Exception as e:
+                error_count += 1
+                self.create_sync_log(item.item_code, "Error", str(e))
+        
+        # Unchanged products need no request
+        success_count += sum(1 for op in operations.values() if op["action"] == "skip")
+        operations = [op for op in operations.values() if op["action"] != "skip"]
+        if not operations:
+            return success_count, error_count
+        
+        results = send_operations(self.base_url, self.get_headers(), operations,
+                                  self.settings.get("max_in_flight_requests"),
+                                  cint(self.settings.get("api_rate_limit")) or DEFAULT_RATE_LIMIT)
+        
+        for operation, result in zip(operations, results):
+            try:
+                if isinstance(result, Exception):
+                    self.create_sync_log(operation["item"].item_code, "Error", str(result))
+                    recorded = False
+                else:
+                    recorded = self.record_sync_result(operation, *result)
+            except Exception:
+                # Already logged; the rest of the batch is still recorded
+                recorded = False
+            
+            if recorded:
+                success_count += 1
+            else:
+                error_count += 1
+        
+        return success_count, error_count
+    
+    def import_orders(self):
+        """
+        Import new Wix orders as Sales Orders, continuing from the stored watermark
+        Safe to re-run: orders that already have a Sales Order are skipped
+        """
+        from frappe.utils.synchronization import filelock
+        
+        # One import at a time so overlapping runs cannot race on the same orders
+        with filelock("wix_order_import", timeout=5):
+            return import_wix_orders(self)
+    
     def get_item_price(self, item_doc):
         """Get item price from price list or standard rate"""
         try:
-            # Try to get from Item Price
-            price_doc = frappe.get_all("Item Price", 
-                                     filters={"item_code": item_doc.item_code},
-                                     fields=["price_list_rate"], 
-                                     limit=1)
-            if price_doc:
-                return float(price_doc[0].price_list_rate)
+            if item_doc.item_code in self._price_cache:
+                price = self._price_cache[item_doc.item_code]
+            else:
+                # Try to get from Item Price
+                price = self.get_item_price_map([item_doc.item_code]).get(item_doc.item_code)
+            if price is not None:
+                return float(price)
             
             # Fallback to standard rate
             return float(getattr(item_doc, 'standard_rate', 0) or 0)
         except:
             return 0.0
     
+    def get_item_price_map(self, item_codes):
+        """Item Price rate for many items with one query, None where an item has no price"""
+        if not item_codes:
+            return {}
+        
+        rows = frappe.get_all("Item Price",
+                              filters={"item_code": ["in", list(item_codes)]},
+                              fields=["item_code", "price_list_rate"],
+                              order_by="modified desc")
+        
+        prices = {item_code: None for item_code in item_codes}
+        for row in rows:
+            # Most recently modified price wins
+            if prices.get(row.item_code) is None:
+                prices[row.item_code] = row.price_list_rate
+        return prices
+    
     def get_item_weight(self, item_doc):
         """Get item weight"""
         try:
@@ -165,16 +639,72 @@ class WixSyncManager:
             return 0.0
     
     def get_item_stock_qty(self, item_doc):
-        """Get current stock quantity"""
+        """Get current stock quantity from the prefetched batch, or query it"""
         try:
-            # Get actual stock from Stock Ledger
-            stock_qty = frappe.db.get_value("Bin", 
-                                          {"item_code": item_doc.item_code}, 
-                                          "actual_qty")
-            return int(stock_qty or 0)
+            if item_doc.item_code in self._stock_cache:
+                return self._stock_cache[item_doc.item_code]
+            return self.get_stock_qty_map([item_doc.item_code]).get(item_doc.item_code, 0)
         except:
             return 0
     
+    def get_stock_qty_map(self, item_codes):
+        """
+        Storefront stock for many items with one grouped SUM over Bin
+        Scoped to the configured warehouses / warehouse group and quantity basis
+        """
+        if not item_codes:
+            return {}
+        
+        qty_column, conditions, values = self.get_stock_scope()
+        values = dict(values, item_codes=list(item_codes))
+        
+        rows = frappe.db.sql(f"""
+            SELECT b.item_code, SUM({qty_column}) AS qty
+            FROM `tabBin` b
+            INNER JOIN `tabWarehouse` w ON w.name = b.warehouse
+            WHERE b.item_code IN %(item_codes)s
+            {conditions}
+            GROUP BY b.item_code
+        """, values, as_dict=True)
+        
+        stock = {item_code: 0 for item_code in item_codes}
+        for row in rows:
+            # Reservations can push the net figure below zero
+            stock[row.item_code] = max(0, int(row.qty or 0))
+        return stock
+    
+    def get_stock_scope(self):
+        """SQL quantity expression and warehouse filter from settings, built once"""
+        if self._stock_scope is not None:
+            return self._stock_scope
+        
+        settings = self.settings or {}
+        qty_column = {
+            "Actual minus Reserved": "b.actual_qty - b.reserved_qty",
+            "Projected Qty": "b.projected_qty"
+        }.get(settings.get("stock_qty_basis"), "b.actual_qty")
+        
+        warehouse_filters = []
+        values = {}
+        
+        warehouses = [row.warehouse for row in (settings.get("stock_warehouses") or []) if row.warehouse]
+        if warehouses:
+            warehouse_filters.append("b.warehouse IN %(warehouses)s")
+            values["warehouses"] = warehouses
+        
+        warehouse_group = settings.get("stock_warehouse_group")
+        if warehouse_group:
+            bounds = frappe.db.get_value("Warehouse", warehouse_group, ["lft", "rgt"], as_dict=True)
+            if bounds:
+                warehouse_filters.append("(w.lft >= %(group_lft)s AND w.rgt <= %(group_rgt)s)")
+                values.update(group_lft=bounds.lft, group_rgt=bounds.rgt)
+        
+        # No scope configured means every warehouse counts
+        conditions = f"AND ({' OR '.join(warehouse_filters)})" if warehouse_filters else ""
+        
+        self._stock_scope = (qty_column, conditions, values)
+        return self._stock_scope
+    
     def get_existing_sync_log(self, item_code):
         """Check if item was previously synced"""
         try:
@@ -183,10 +713,44 @@ class WixSyncManager:
                                fields=["wix_product_id", "sync_status"],
                                order_by="creation desc",
                                limit=1)
-            return log[0] if log else None
+            # A success without a product id marks a product deleted from Wix
+            return log[0] if log and log[0].wix_product_id else None
         except:
             return None
     
+    def get_sync_state(self, item_code):
+        """Wix product id and last pushed payload hash, from the prefetched batch or queried"""
+        if item_code in self._sync_state_cache:
+            return self._sync_state_cache[item_code]
+        return self.get_sync_state_map([item_code]).get(item_code)
+    
+    def get_sync_state_map(self, item_codes):
+        """Sync state for many items with one query over Wix Sync Status, None where never synced"""
+        if not item_codes:
+            return {}
+        
+        rows = frappe.get_all("Wix Sync Status",
+                              filters={"name": ["in", list(item_codes)]},
+                              fields=["name", "wix_product_id", "payload_hash"])
+        
+        state = {item_code: None for item_code in item_codes}
+        state.update({row.name: row for row in rows})
+        return state
+    
+    def get_product_id_map(self):
+        """
+        Current Wix product id for every synced item, read from Wix Sync Status
+        Items deleted from Wix have an empty product id and are left out
+        """
+        rows = frappe.get_all("Wix Sync Status",
+                              filters={"wix_product_id": ["is", "set"]},
+                              fields=["name", "wix_product_id"])
+        return {row.name: row.wix_product_id for row in rows}
+    
+    def sync_categories(self):
+        """Sync Item Groups to Wix categories and their product membership"""
+        return sync_wix_categories(self)
+    
     def update_item_with_wix_id(self, item_name, wix_product_id):
         """Store Wix product ID in Item custom field"""
         try:
@@ -195,18 +759,21 @@ class WixSyncManager:
         except:
             pass  # Custom field might not exist
     
-    def create_sync_log(self, item_code, status, error_message="", wix_product_id=""):
-        """Create sync log entry with fixed status handling"""
+    def create_sync_log(self, item_code, status, error_message="", wix_product_id="", payload_hash=None):
+        """
+        Create sync log entry with fixed status handling
+        Wix Sync Status holds the product mapping, so a failed status write is raised
+        """
+        # Map status to valid field options - fixes field validation issue
+        valid_status_map = {
+            "Success": "Success",
+            "Error": "Error",
+            "Failed": "Error"  # Map Failed to Error since field options are malformed
+        }
+        
+        mapped_status = valid_status_map.get(status, "Error")
+        
         try:
-            # Map status to valid field options - fixes field validation issue
-            valid_status_map = {
-                "Success": "Success",
-                "Error": "Error",
-                "Failed": "Error"  # Map Failed to Error since field options are malformed
-            }
-            
-            mapped_status = valid_status_map.get(status, "Error")
-            
             sync_log = frappe.get_doc({
                 "doctype": "Wix Sync Log",
                 "item_code": item_code,
@@ -215,10 +782,102 @@ class WixSyncManager:
                 "wix_product_id": wix_product_id,
                 "error_message": error_message
             })
+            # Logs must outlive the Item, e.g. when recording a deletion
+            sync_log.flags.ignore_links = True
             sync_log.insert(ignore_permissions=True)
-            frappe.db.commit()
         except Exception as e:
             frappe.log_error(f"Failed to create sync log: {str(e)}")
+            sync_datetime = datetime.now()
+        else:
+            sync_datetime = sync_log.sync_datetime
+        
+        # Keep the per-item summary and dashboard counters in step with the log
+        frappe.db.savepoint("wix_sync_status")
+        try:
+            record_sync_outcome(item_code, mapped_status, error_message,
+                                wix_product_id, sync_datetime, payload_hash)
+        except Exception as e:
+            frappe.db.rollback(save_point="wix_sync_status")
+            # The log is kept - it records the product id for a manual fix
+            frappe.db.commit()
+            frappe.log_error(f"Failed to update Wix sync status for {item_code}: {str(e)}")
+            raise
+        
+        # Keep the prefetched state current for items seen again in this batch
+        if mapped_status == "Success" and item_code in self._sync_state_cache:
+            self._sync_state_cache[item_code] = frappe._dict(wix_product_id=wix_product_id,
+                                                             payload_hash=payload_hash or "")
+        
+        frappe.db.commit()
+
+def get_payload_hash(payload):
+    """Stable hash of the product fields an update sends"""
+    product = {key: value for key, value in payload.get("product", {}).items()
+               if key not in CREATE_ONLY_FIELDS}
+    return hashlib.md5(json.dumps(product, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def iter_chunks(items, size):
+    """Group any iterable into lists of at most `size` items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_item_pages(conditions="", values=None, page_size=ITEM_PAGE_SIZE):
+    """
+    Yield pages of Item rows using keyset pagination on `name`
+    Only ITEM_SYNC_FIELDS are selected; `conditions` is an extra SQL fragment
+    (starting with AND) against the `i` alias using named `values`
+    """
+    columns = ", ".join(f"i.`{field}`" for field in ITEM_SYNC_FIELDS)
+    params = dict(values or {})
+    params["page_size"] = page_size
+    last_name = ""
+    
+    while True:
+        params["last_name"] = last_name
+        rows = frappe.db.sql(f"""
+            SELECT {columns}
+            FROM `tabItem` i
+            WHERE i.name > %(last_name)s
+            {conditions}
+            ORDER BY i.name
+            LIMIT %(page_size)s
+        """, params, as_dict=True)
+        
+        if not rows:
+            return
+        
+        yield rows
+        
+        if len(rows) < page_size:
+            return
+        last_name = rows[-1].name
+
+def iter_sales_items(conditions="", values=None, page_size=ITEM_PAGE_SIZE):
+    """
+    Stream enabled sales Item rows one at a time, page by page
+    Variants are left out; they are synced through their template
+    """
+    base_conditions = "AND i.is_sales_item = 1 AND i.disabled = 0 AND IFNULL(i.variant_of, '') = '' "
+    for page in iter_item_pages(base_conditions + conditions, values, page_size):
+        for row in page:
+            yield row
+
+def iter_items_by_code(item_codes, page_size=ITEM_PAGE_SIZE):
+    """Stream Item rows for the given item codes, preserving their order"""
+    for start in range(0, len(item_codes), page_size):
+        chunk = item_codes[start:start + page_size]
+        rows = frappe.get_all("Item",
+                              filters={"name": ["in", chunk]},
+                              fields=list(ITEM_SYNC_FIELDS))
+        rows_by_name = {row.name: row for row in rows}
+        for item_code in chunk:
+            yield item_code, rows_by_name.get(item_code)
 
 # Updated legacy function to use new WixSyncManager
 def sync_item_to_wix(doc, method):
@@ -234,95 +893,291 @@ def sync_item_to_wix(doc, method):
         if not settings or not settings.get("enable_sync"):
             return
         
-        # Skip if item is not for sale
-        if not getattr(doc, 'is_sales_item', True):
+        # Skip if item is not for sale, hiding it on Wix if it just stopped being one
+        if not sync_manager.is_item_visible(doc):
+            if doc.get("variant_of"):
+                # Re-sync the template so the variant drops out of its options
+                enqueue_priority_sync(doc.variant_of)
+            elif doc.has_value_changed("disabled") or doc.has_value_changed("is_sales_item"):
+                existing_sync = sync_manager.get_existing_sync_log(doc.item_code)
+                if existing_sync:
+                    queue_product_removal(doc.item_code, existing_sync.wix_product_id, ACTION_HIDE)
             return
         
-        # Use new sync manager
-        sync_manager.sync_item_to_wix(doc)
+        # Item saves are interactive - sync on the short queue ahead of bulk work
+        enqueue_priority_sync(doc.item_code)
         
     except Exception as e:
         frappe.log_error(f"Auto-sync failed for {doc.item_code}: {str(e)}")
 
+def remove_item_from_wix(doc, method):
+    """on_trash hook - delete the Item's Wix product in the next bulk flush"""
+    try:
+        sync_manager = WixSyncManager()
+        settings = sync_manager.settings
+        
+        if not settings or not settings.get("enable_sync"):
+            return
+        
+        if doc.get("variant_of"):
+            # Variants live inside the template's product; re-sync it without this one
+            enqueue_priority_sync(doc.variant_of)
+            return
+        
+        existing_sync = sync_manager.get_existing_sync_log(doc.item_code)
+        if existing_sync:
+            queue_product_removal(doc.item_code, existing_sync.wix_product_id, ACTION_DELETE)
+        
+    except Exception as e:
+        frappe.log_error(f"Wix removal failed for {doc.item_code}: {str(e)}")
+
+def rename_item_sync_status(doc, method, old, new, merge=False):
+    """
+    after_rename hook - Wix Sync Status rows are named by item code, so move the
+    row with the Item; otherwise the next sync would create a second product
+    """
+    try:
+        if not frappe.db.exists("Wix Sync Status", old):
+            return
+        
+        if frappe.db.exists("Wix Sync Status", new):
+            # Merged into an Item that has its own product - retire the old one
+            old_product_id = frappe.db.get_value("Wix Sync Status", old, "wix_product_id")
+            if old_product_id and old_product_id != frappe.db.get_value("Wix Sync Status", new, "wix_product_id"):
+                queue_product_removal(new, old_product_id, ACTION_DELETE)
+            frappe.delete_doc("Wix Sync Status", old, ignore_permissions=True, force=True)
+            rebuild_sync_counters()
+        else:
+            frappe.rename_doc("Wix Sync Status", old, new, force=True,
+                              ignore_permissions=True, show_alert=False)
+        
+        # The SKU on Wix is the item code
+        sync_manager = WixSyncManager(notify=False)
+        if (sync_manager.settings or {}).get("enable_sync") and sync_manager.is_item_visible(doc):
+            enqueue_priority_sync(doc.variant_of or new)
+        
+    except Exception as e:
+        frappe.log_error(f"Wix sync status rename failed for {old} -> {new}: {str(e)}")
+
 # Manual sync functions - updated
 @frappe.whitelist()
-def manual_sync_single_item(item_code):
+def manual_sync_single_item(item_code, profile=None):
     """Manually sync a single item"""
     try:
         item_doc = frappe.get_doc("Item", item_code)
         sync_manager = WixSyncManager()
-        result = sync_manager.sync_item_to_wix(item_doc)
+        
+        with sync_manager.profiled_run("Single Item Sync", profile) as run:
+            # An explicit sync always pushes, even when nothing changed
+            result = sync_manager.sync_item_to_wix(item_doc, force=True)
+            run.set_result(1 if result else 0, 0 if result else 1)
         
         return {
             "success": result,
-            "message": f"Sync {'successful' if result else 'failed'} for {item_code}"
+            "message": f"Sync {'successful' if result else 'failed'} for {item_code}",
+            "profile_run": run.run_name
         }
     except Exception as e:
         frappe.throw(str(e))
 
 @frappe.whitelist()
-def manual_sync_all_items():
-    """Manually sync all items"""
+def manual_sync_all_items(profile=None, dry_run=None, force=None):
+    """
+    Manually sync all items, or only plan the sync with dry_run=1
+    force=1 pushes unchanged products too, e.g. to repair edits made on Wix
+    """
     try:
-        # Get all sales items
-        items = frappe.get_all("Item", 
-                             filters={"is_sales_item": 1},
-                             fields=["name", "item_code", "item_name"])
+        if cint(dry_run):
+            return WixSyncManager(notify=False, dry_run=True).plan_sync(iter_sales_items(), cint(force))
         
-        sync_manager = WixSyncManager()
-        success_count = 0
-        error_count = 0
+        # A full backfill is bulk work - it runs on the long queue, never in the request
+        frappe.enqueue(
+            "zm_frappe_wix_sync.api.wix_sync.run_full_sync",
+            queue=get_queue_for(PRIORITY_LOW),
+            timeout=4 * 3600,
+            job_id="wix_full_sync",
+            deduplicate=True,
+            user=frappe.session.user,
+            queued_at=time.time(),
+            profile=profile,
+            force=cint(force)
+        )
         
-        for item in items:
-            try:
-                item_doc = frappe.get_doc("Item", item.name)
-                if sync_manager.sync_item_to_wix(item_doc):
-                    success_count += 1
-                else:
-                    error_count += 1
-            except Exception as e:
-                error_count += 1
-                frappe.log_error(f"Manual sync failed for {item.item_code}: {str(e)}")
-        
-        return {
-            "message": f"Sync completed: {success_count} successful, {error_count} failed",
-            "success_count": success_count,
-            "error_count": error_count
-        }
+        return {"message": "Full Wix sync queued"}
     except Exception as e:
         frappe.throw(str(e))
 
+def run_full_sync(user=None, queued_at=None, profile=None, force=False):
+    """Background job for manual_sync_all_items - syncs every enabled sales item"""
+    record_queue_wait(PRIORITY_LOW, queued_at)
+    
+    success_count = 0
+    error_count = 0
+    error = None
+    run = None
+    
+    try:
+        # Stream sales items page by page instead of loading the whole catalog
+        sync_manager = WixSyncManager(notify=False)
+        
+        with sync_manager.profiled_run("Full Sync", profile) as run:
+            success_count, error_count = sync_manager.sync_items(iter_sales_items(), force)
+            run.set_result(success_count, error_count)
+    except Exception as e:
+        error = str(e)
+        frappe.log_error(f"Full Wix sync failed: {error}")
+        raise
+    finally:
+        # Callers wait for this event, so it is sent however the run ends
+        frappe.publish_realtime("wix_full_sync_done", {
+            "success_count": success_count,
+            "error_count": error_count,
+            "failed": bool(error),
+            "message": (f"Sync stopped: {error}" if error
+                        else f"Sync completed: {success_count} successful, {error_count} failed"),
+            "profile_run": run.run_name if run else None
+        }, user=user)
+
 @frappe.whitelist()
-def test_wix_connection():
-    """Test Wix API connection - updated with working authentication"""
+def enqueue_bulk_sync(item_codes, priority=None, profile=None, bulk_id=None):
+    """
+    Queue one background job that syncs the selected items
+    Returns immediately; progress is pushed to the caller via realtime events.
+    Small selections run at high priority on the short queue, larger ones on
+    the long queue unless `priority` is given. Callers that pass their own
+    `bulk_id` can subscribe to its events before the job is queued
+    """
+    frappe.only_for(SYNC_ROLES)
+    
+    # A single item code may be passed on its own, as plain text or a JSON string
     try:
-        sync_manager = WixSyncManager()
+        item_codes = frappe.parse_json(item_codes) or []
+    except ValueError:
+        item_codes = [item_codes]
+    if isinstance(item_codes, str):
+        item_codes = [item_codes]
+    if not isinstance(item_codes, (list, tuple)):
+        frappe.throw("item_codes must be a list of item codes")
+    
+    # Drop duplicates while keeping the selection order
+    item_codes = list(dict.fromkeys(cstr(code) for code in item_codes if code))
+    
+    if not item_codes:
+        frappe.throw("Please select at least one item")
+    
+    if priority not in (PRIORITY_HIGH, PRIORITY_LOW):
+        priority = get_priority_for_batch(len(item_codes))
+    
+    bulk_id = cstr(bulk_id)[:40] or frappe.generate_hash(length=10)
+    frappe.enqueue(
+        "zm_frappe_wix_sync.api.wix_sync.run_bulk_sync",
+        queue=get_queue_for(priority),
+        timeout=max(1500, len(item_codes) * 30),
+        bulk_id=bulk_id,
+        item_codes=item_codes,
+        user=frappe.session.user,
+        priority=priority,
+        queued_at=time.time(),
+        profile=profile
+    )
+    
+    return {
+        "bulk_id": bulk_id,
+        "total": len(item_codes),
+        "priority": priority,
+        "message": f"Queued {len(item_codes)} items for Wix sync"
+    }
+
+def run_bulk_sync(bulk_id, item_codes, user, priority=PRIORITY_LOW, queued_at=None, profile=None):
+    """Background job for enqueue_bulk_sync - syncs items and publishes per-item progress"""
+    record_queue_wait(priority, queued_at)
+    
+    success_count = 0
+    error_count = 0
+    error = None
+    run = None
+    
+    try:
+        sync_manager = WixSyncManager(notify=False)
+        with sync_manager.profiled_run("Bulk Sync", profile) as run:
+            success_count, error_count = sync_bulk_items(sync_manager, bulk_id, item_codes, user, priority)
+            run.set_result(success_count, error_count)
+    except Exception as e:
+        error = str(e)
+        frappe.log_error(f"Bulk sync {bulk_id} failed: {error}")
+        raise
+    finally:
+        # The list view closes its progress dialog on this event, so it is always sent
+        frappe.publish_realtime("wix_bulk_sync_done", {
+            "bulk_id": bulk_id,
+            "total": len(item_codes),
+            "success_count": success_count,
+            "error_count": error_count,
+            "failed": bool(error),
+            "message": (f"Sync stopped: {error}" if error
+                        else f"Sync completed: {success_count} successful, {error_count} failed"),
+            "profile_run": run.run_name if run else None
+        }, user=user)
+
+def sync_bulk_items(sync_manager, bulk_id, item_codes, user, priority):
+    """Sync the items of a bulk job one by one, publishing progress after each"""
+    total = len(item_codes)
+    success_count = 0
+    error_count = 0
+    synced_templates = set()
+    drained = set()
+    
+    for processed, (item_code, item) in enumerate(iter_items_by_code(item_codes), start=1):
+        # Low-priority runs let interactive syncs go first between chunks
+        if priority == PRIORITY_LOW and processed % PRIORITY_CHECK_INTERVAL == 0:
+            drained |= drain_priority_items()
         
-        # Test API connection by querying products
-        url = f"{sync_manager.base_url}/stores-catalog/v3/products/query"
-        response = requests.post(url, headers=sync_manager.get_headers(), json={}, timeout=30)
+        message = ""
+        try:
+            if not item:
+                success = False
+                message = "Item not found"
+            elif item_code in drained:
+                # Pushed from a fresh read by an interactive sync; this row is stale
+                success = True
+                message = "Synced by an interactive save"
+            elif item.variant_of and item.variant_of in synced_templates:
+                # Already pushed along with its template earlier in this run
+                success = True
+                message = f"Synced with template {item.variant_of}"
+            else:
+                success = sync_manager.sync_item_to_wix(item, force=True)
+                if success:
+                    synced_templates.add(item.variant_of or item.name)
+        except Exception as e:
+            success = False
+            message = str(e)
+            frappe.log_error(f"Bulk sync failed for {item_code}: {message}")
         
-        if response.status_code in [200, 201]:
-            # Update connection status
-            settings = sync_manager.get_sync_settings()
-            settings.connection_status = "✅ Connection successful!"
-            settings.last_test_datetime = datetime.now()
-            settings.save(ignore_permissions=True)
-            frappe.db.commit()
-            
-            return {"success": True, "message": "✅ Wix connection successful!"}
+        if success:
+            success_count += 1
         else:
-            error_msg = f"Connection failed: {response.status_code} - {response.text}"
-            
-            # Update connection status
-            settings = sync_manager.get_sync_settings()
-            settings.connection_status = f"❌ {error_msg}"
-            settings.last_test_datetime = datetime.now()
-            settings.save(ignore_permissions=True)
-            frappe.db.commit()
-            
-            return {"success": False, "message": error_msg}
-            
+            error_count += 1
+        
+        frappe.publish_realtime("wix_bulk_sync_progress", {
+            "bulk_id": bulk_id,
+            "item_code": item_code,
+            "success": success,
+            "message": message,
+            "processed": processed,
+            "total": total
+        }, user=user)
+    
+    return success_count, error_count
+
+@frappe.whitelist()
+def test_wix_connection():
+    """
+    Test Wix API connection with a fresh health probe
+    The result is cached for polling; the settings document is not touched
+    """
+    try:
+        return get_connection_health(refresh=True)
     except Exception as e:
         return {"success": False, "message": f"Connection test failed: {str(e)}"}
 
@@ -330,41 +1185,114 @@ def test_wix_connection():
 def scheduled_sync_items():
     """Scheduled sync job - runs hourly to catch missed items"""
     try:
-        from datetime import timedelta
-        
-        # Get items modified in last 2 hours without successful sync
-        two_hours_ago = datetime.now() - timedelta(hours=2)
+        sync_manager = WixSyncManager(notify=False)
+        with sync_manager.profiled_run("Scheduled Sync") as run:
+            run.set_result(*sync_manager.sync_items(iter_incremental_sync_items()))
+                
+        frappe.db.commit()
         
-        # Find items that need syncing
-        items_to_sync = frappe.db.sql("""
-            SELECT i.name, i.item_code, i.item_name 
-            FROM `tabItem` i
-            WHERE i.modified >= %s
-            AND i.is_sales_item = 1
-            AND NOT EXISTS (
-                SELECT 1 FROM `tabWix Sync Log` wsl 
-                WHERE wsl.item_code = i.item_code 
-                AND wsl.sync_status = 'Success'
-                AND wsl.sync_datetime >= %s
+    except Exception as e:
+        frappe.log_error(f"Scheduled sync job failed: {str(e)}")
+
+@frappe.whitelist()
+def plan_incremental_sync():
+    """Dry-run plan for the items the next scheduled sync would pick up"""
+    return WixSyncManager(notify=False, dry_run=True).plan_sync(iter_incremental_sync_items())
+
+def iter_incremental_sync_items():
+    """
+    Items the scheduled sync picks up - modified in the last 2 hours without a
+    successful sync since, streamed in keyset pages
+    """
+    from datetime import timedelta
+    
+    two_hours_ago = datetime.now() - timedelta(hours=2)
+    
+    # A template is due when it or any of its variants changed
+    return iter_sales_items("""
+        AND (
+            i.modified >= %(since)s
+            OR EXISTS (
+                SELECT 1 FROM `tabItem` v
+                WHERE v.variant_of = i.name
+                AND v.modified >= %(since)s
             )
-        """, (two_hours_ago, two_hours_ago), as_dict=True)
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM `tabWix Sync Log` wsl 
+            WHERE wsl.item_code = i.item_code 
+            AND wsl.sync_status = 'Success'
+            AND wsl.sync_datetime >= %(since)s
+        )
+    """, {"since": two_hours_ago})
+
+def scheduled_sync_categories():
+    """Scheduled job - syncs Item Groups to Wix categories when enabled"""
+    try:
+        sync_manager = WixSyncManager(notify=False)
+        settings = sync_manager.settings
         
-        if not items_to_sync:
+        if not settings or not settings.get("enable_sync") or not settings.get("sync_categories"):
             return
         
-        sync_manager = WixSyncManager()
+        sync_manager.sync_categories()
         
-        for item in items_to_sync:
-            try:
-                item_doc = frappe.get_doc("Item", item.name)
-                sync_manager.sync_item_to_wix(item_doc)
-            except Exception as e:
-                frappe.log_error(f"Scheduled sync failed for {item.item_code}: {str(e)}")
-                
-        frappe.db.commit()
+    except Exception as e:
+        frappe.log_error(f"Scheduled Wix category sync failed: {str(e)}")
+
+@frappe.whitelist()
+def manual_sync_categories():
+    """Queue an Item Group to Wix category sync on the long queue"""
+    frappe.only_for(SYNC_ROLES)
+    frappe.enqueue(
+        "zm_frappe_wix_sync.api.wix_sync.run_category_sync",
+        queue=get_queue_for(PRIORITY_LOW),
+        job_id="wix_category_sync",
+        deduplicate=True
+    )
+    return {"message": "Wix category sync queued"}
+
+def run_category_sync():
+    """Background job for manual_sync_categories"""
+    try:
+        summary = WixSyncManager(notify=False).sync_categories()
+        frappe.logger().info(f"Wix category sync finished: {summary}")
+    except Exception as e:
+        frappe.log_error(f"Wix category sync failed: {str(e)}")
+
+def scheduled_import_orders():
+    """Scheduled job - imports Wix orders when order import is enabled"""
+    try:
+        sync_manager = WixSyncManager(notify=False)
+        settings = sync_manager.settings
+        
+        if not settings or not settings.get("enable_order_import"):
+            return
+        
+        sync_manager.import_orders()
         
     except Exception as e:
-        frappe.log_error(f"Scheduled sync job failed: {str(e)}")
+        frappe.log_error(f"Scheduled Wix order import failed: {str(e)}")
+
+@frappe.whitelist()
+def manual_import_orders():
+    """Queue a Wix order import on the long queue"""
+    frappe.only_for(SYNC_ROLES)
+    frappe.enqueue(
+        "zm_frappe_wix_sync.api.wix_sync.run_order_import",
+        queue=get_queue_for(PRIORITY_LOW),
+        job_id="wix_order_import",
+        deduplicate=True
+    )
+    return {"message": "Wix order import queued"}
+
+def run_order_import():
+    """Background job for manual_import_orders"""
+    try:
+        summary = WixSyncManager(notify=False).import_orders()
+        frappe.logger().info(f"Wix order import finished: {summary}")
+    except Exception as e:
+        frappe.log_error(f"Wix order import failed: {str(e)}")
 
 # Legacy functions maintained for backward compatibility
 def get_wix_sync_settings():
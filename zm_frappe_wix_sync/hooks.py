@@ -101,18 +101,34 @@ doctype_list_js = {"Item" : "public/js/item_list.js"}
 doc_events = {
     "Item": {
         "after_insert": "zm_frappe_wix_sync.api.wix_sync.sync_item_to_wix",
-        "on_update": "zm_frappe_wix_sync.api.wix_sync.sync_item_to_wix"
+        "on_update": "zm_frappe_wix_sync.api.wix_sync.sync_item_to_wix",
+        "on_trash": "zm_frappe_wix_sync.api.wix_sync.remove_item_from_wix",
+        "after_rename": "zm_frappe_wix_sync.api.wix_sync.rename_item_sync_status"
     }
 }
 
+# Sync logs and status rows are history - they must not block deleting an Item.
+# Category maps of deleted Item Groups are cleaned up by the category sync.
+ignore_links_on_delete = ["Wix Sync Log", "Wix Sync Status", "Wix Category Map"]
+
 # Scheduled Tasks
 # ---------------
 # Added scheduled sync job to catch any missed items
+# Runs on the long queue so it never delays interactive syncs
 
 scheduler_events = {
-    "hourly": [
-        "zm_frappe_wix_sync.api.wix_sync.scheduled_sync_items"
-    ]
+    "hourly_long": [
+        "zm_frappe_wix_sync.api.wix_sync.scheduled_sync_items",
+        "zm_frappe_wix_sync.api.wix_sync.scheduled_sync_categories",
+        # Retry any hides/deletes left over from a failed flush
+        "zm_frappe_wix_sync.api.product_removal.flush_product_removals"
+    ],
+    # Pull new Wix orders into Sales Orders
+    "cron": {
+        "*/15 * * * *": [
+            "zm_frappe_wix_sync.api.wix_sync.scheduled_import_orders"
+        ]
+    }
 }
 
 # Testing
@@ -176,5 +192,12 @@ user_data_fields = [
 override_whitelisted_methods = {
     "zm_frappe_wix_sync.api.wix_sync.test_wix_connection": "zm_frappe_wix_sync.api.wix_sync.test_wix_connection",
     "zm_frappe_wix_sync.api.wix_sync.manual_sync_single_item": "zm_frappe_wix_sync.api.wix_sync.manual_sync_single_item",
-    "zm_frappe_wix_sync.api.wix_sync.manual_sync_all_items": "zm_frappe_wix_sync.api.wix_sync.manual_sync_all_items"
+    "zm_frappe_wix_sync.api.wix_sync.manual_sync_all_items": "zm_frappe_wix_sync.api.wix_sync.manual_sync_all_items",
+    "zm_frappe_wix_sync.api.wix_sync.plan_incremental_sync": "zm_frappe_wix_sync.api.wix_sync.plan_incremental_sync",
+    "zm_frappe_wix_sync.api.wix_sync.enqueue_bulk_sync": "zm_frappe_wix_sync.api.wix_sync.enqueue_bulk_sync",
+    "zm_frappe_wix_sync.api.sync_queue.get_sync_queue_status": "zm_frappe_wix_sync.api.sync_queue.get_sync_queue_status",
+    "zm_frappe_wix_sync.api.wix_sync.manual_import_orders": "zm_frappe_wix_sync.api.wix_sync.manual_import_orders",
+    "zm_frappe_wix_sync.api.wix_sync.manual_sync_categories": "zm_frappe_wix_sync.api.wix_sync.manual_sync_categories",
+    "zm_frappe_wix_sync.api.sync_status.get_sync_dashboard": "zm_frappe_wix_sync.api.sync_status.get_sync_dashboard",
+    "zm_frappe_wix_sync.api.connection_health.get_connection_health": "zm_frappe_wix_sync.api.connection_health.get_connection_health"
 }
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, ZM Tech and contributors
+# For license information, please see license.txt
+
+from __future__ import unicode_literals
+import frappe
+
+def execute():
+    """
+    Build Wix Sync Status rows and global counters from existing Wix Sync Log entries.
+    
+    New sync outcomes update the summary incrementally; this one-off backfill
+    covers everything logged before the summary existed.
+    """
+    frappe.reload_doc("zm_frappe_wix_sync", "doctype", "wix_sync_status")
+    frappe.reload_doc("zm_frappe_wix_sync", "doctype", "wix_sync_counter")
+    
+    from zm_frappe_wix_sync.api.sync_status import rebuild_sync_counters
+    
+    if frappe.db.count("Wix Sync Status"):
+        frappe.logger().info("Wix Sync Status already populated, rebuilding counters only")
+        rebuild_sync_counters()
+        frappe.db.commit()
+        return
+    
+    summaries = frappe.db.sql("""
+        SELECT item_code,
+            COUNT(*) AS attempt_count,
+            MAX(sync_datetime) AS last_attempt,
+            MAX(CASE WHEN sync_status = 'Success' THEN sync_datetime END) AS last_success,
+            MAX(CASE WHEN sync_status != 'Success' THEN sync_datetime END) AS last_error
+        FROM `tabWix Sync Log`
+        GROUP BY item_code
+    """, as_dict=True)
+    
+    # Product id and error text come from the latest log of each kind
+    product_ids = dict(frappe.db.sql("""
+        SELECT l.item_code, l.wix_product_id
+        FROM `tabWix Sync Log` l
+        INNER JOIN (
+            SELECT item_code, MAX(creation) AS creation
+            FROM `tabWix Sync Log`
+            WHERE sync_status = 'Success'
+            GROUP BY item_code
+        ) latest ON latest.item_code = l.item_code AND latest.creation = l.creation
+    """))
+    error_messages = dict(frappe.db.sql("""
+        SELECT l.item_code, l.error_message
+        FROM `tabWix Sync Log` l
+        INNER JOIN (
+            SELECT item_code, MAX(creation) AS creation
+            FROM `tabWix Sync Log`
+            WHERE sync_status != 'Success'
+            GROUP BY item_code
+        ) latest ON latest.item_code = l.item_code AND latest.creation = l.creation
+    """))
+    
+    now = frappe.utils.now()
+    fields = ["name", "item_code", "current_status", "wix_product_id", "attempt_count",
+              "last_attempt", "last_success", "last_error", "last_error_message",
+              "creation", "modified", "owner", "modified_by"]
+    values = []
+    
+    for row in summaries:
+        is_success = bool(row.last_success) and row.last_success == row.last_attempt
+        values.append((
+            row.item_code,
+            row.item_code,
+            "Success" if is_success else "Error",
+            product_ids.get(row.item_code) or "",
+            row.attempt_count,
+            row.last_attempt,
+            row.last_success,
+            row.last_error,
+            error_messages.get(row.item_code) or "",
+            now,
+            now,
+            "Administrator",
+            "Administrator"
+        ))
+    
+    if values:
+        frappe.db.bulk_insert("Wix Sync Status", fields, values, ignore_duplicates=True)
+    
+    rebuild_sync_counters()
+    frappe.db.commit()
+    
+    frappe.logger().info(f"Backfilled Wix Sync Status for {len(values)} items")
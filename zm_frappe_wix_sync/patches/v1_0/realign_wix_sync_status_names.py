@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, ZM Tech and contributors
+# For license information, please see license.txt
+
+from __future__ import unicode_literals
+import frappe
+
+def execute():
+    """
+    Rename Wix Sync Status rows left under an old item code by Item renames.
+    
+    Rows are looked up by name, which is the item code; the Link field followed
+    the rename but the name did not. Where a newer row already exists for the new
+    code, the stale row is dropped.
+    """
+    from zm_frappe_wix_sync.api.sync_status import rebuild_sync_counters
+    
+    stale = frappe.db.sql("""
+        SELECT name, item_code
+        FROM `tabWix Sync Status`
+        WHERE name != item_code
+    """, as_dict=True)
+    
+    for row in stale:
+        if frappe.db.exists("Wix Sync Status", row.item_code):
+            frappe.delete_doc("Wix Sync Status", row.name, ignore_permissions=True, force=True)
+        else:
+            frappe.rename_doc("Wix Sync Status", row.name, row.item_code, force=True,
+                              ignore_permissions=True, show_alert=False)
+    
+    if stale:
+        rebuild_sync_counters()
+    frappe.db.commit()
+    
+    frappe.logger().info(f"Realigned {len(stale)} Wix Sync Status rows with their item codes")
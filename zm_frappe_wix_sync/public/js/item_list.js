@@ -9,36 +9,91 @@ frappe.listview_settings['Item'] = {
                 return;
             }
             
-            if (selected.length > 1) {
-                frappe.msgprint(__('Please select only one item at a time for sync'));
-                return;
-            }
+            var item_codes = selected.map(function(item) {
+                return item.item_code;
+            });
             
-            var item_code = selected[0].item_code;
+            // Listen before queueing - a short job can finish before the call returns
+            var bulk_id = frappe.utils.get_random(10);
+            var stop_tracking = track_bulk_sync(listview, bulk_id, item_codes.length);
             
             frappe.call({
-                method: 'zm_frappe_wix_sync.api.wix_sync.manual_sync_item',
+                method: 'zm_frappe_wix_sync.api.wix_sync.enqueue_bulk_sync',
                 args: {
-                    item_code: item_code
+                    item_codes: item_codes,
+                    bulk_id: bulk_id
                 },
-                freeze: true,
-                freeze_message: __('Syncing item to Wix...'),
                 callback: function(response) {
                     var result = response.message;
-                    if (result.success) {
-                        frappe.show_alert({
-                            message: __(result.message),
-                            indicator: 'green'
-                        });
-                        listview.refresh();
-                    } else {
-                        frappe.show_alert({
-                            message: __(result.message),
-                            indicator: 'red'
-                        });
+                    if (!result) {
+                        stop_tracking();
+                        return;
                     }
+                    
+                    frappe.show_alert({
+                        message: __(result.message),
+                        indicator: 'blue'
+                    });
+                },
+                error: function() {
+                    stop_tracking();
                 }
             });
         });
     }
 };
+
+// Follow a bulk sync through realtime events until it finishes.
+// Returns a function that stops tracking, for when the sync could not be queued.
+function track_bulk_sync(listview, bulk_id, total) {
+    var progress_title = __('Syncing items to Wix');
+    var failed = [];
+    
+    var on_progress = function(data) {
+        if (data.bulk_id !== bulk_id) {
+            return;
+        }
+        
+        if (!data.success) {
+            failed.push(data.item_code);
+        }
+        
+        frappe.show_progress(progress_title, data.processed, data.total,
+            __('Synced {0} of {1}: {2}', [data.processed, data.total, data.item_code]), true);
+    };
+    
+    var stop = function() {
+        frappe.realtime.off('wix_bulk_sync_progress', on_progress);
+        frappe.realtime.off('wix_bulk_sync_done', on_done);
+        frappe.hide_progress();
+    };
+    
+    var on_done = function(data) {
+        if (data.bulk_id !== bulk_id) {
+            return;
+        }
+        
+        stop();
+        
+        frappe.show_alert({
+            message: __(data.message),
+            indicator: data.failed ? 'red' : (data.error_count ? 'orange' : 'green')
+        });
+        
+        if (failed.length) {
+            frappe.msgprint({
+                title: __('Wix Sync Failures'),
+                message: __('Check Wix Sync Log for: {0}', [failed.join(', ')]),
+                indicator: 'red'
+            });
+        }
+        
+        listview.refresh();
+    };
+    
+    frappe.show_progress(progress_title, 0, total, __('Waiting for background worker...'), true);
+    frappe.realtime.on('wix_bulk_sync_progress', on_progress);
+    frappe.realtime.on('wix_bulk_sync_done', on_done);
+    
+    return stop;
+}
@@ -1,4 +1,14 @@
 frappe.ui.form.on('Wix Sync Settings', {
+    setup: function(frm) {
+        frm.set_query('stock_warehouse_group', function() {
+            return {
+                filters: {
+                    is_group: 1
+                }
+            };
+        });
+    },
+    
     test_connection: function(frm) {
         // Validate required fields before testing
         if (!frm.doc.wix_api_key) {
@@ -19,130 +29,140 @@ frappe.ui.form.on('Wix Sync Settings', {
             return;
         }
         
-        // Save the form first to ensure settings are persisted
-        frm.save().then(() => {
-            // Call the test connection API
-            frm.call({
-                method: 'zm_frappe_wix_sync.api.wix_sync.test_wix_connection',
-                freeze: true,
-                freeze_message: __('Testing connection to Wix...'),
-                callback: function(response) {
-                    if (response && response.message) {
-                        var result = response.message;
-                        
-                        // Update the connection status fields
-                        frm.set_value('last_test_datetime', frappe.datetime.now_datetime());
-                        
-                        if (result.success) {
-                            frm.set_value('connection_status', 'Success: ' + result.message);
-                            frappe.show_alert({
-                                message: __('Connection Test Successful!'),
-                                indicator: 'green'
-                            });
-                            
-                            // Show success message
-                            frappe.msgprint({
-                                title: __('Connection Successful'),
-                                message: result.message,
-                                indicator: 'green'
-                            });
-                        } else {
-                            frm.set_value('connection_status', 'Failed: ' + result.message);
-                            frappe.show_alert({
-                                message: __('Connection Test Failed'),
-                                indicator: 'red'
-                            });
-                            
-                            // Show error message
-                            frappe.msgprint({
-                                title: __('Connection Failed'),
-                                message: result.message,
-                                indicator: 'red'
-                            });
-                        }
-                        
-                        // Save the updated status
-                        frm.save();
-                    } else {
-                        // Handle unexpected response format
-                        frm.set_value('connection_status', 'Error: Unexpected response format');
-                        frm.set_value('last_test_datetime', frappe.datetime.now_datetime());
-                        
-                        frappe.msgprint({
-                            title: __('Connection Test Error'),
-                            message: __('Received unexpected response from server'),
-                            indicator: 'red'
-                        });
-                        
-                        frm.save();
-                    }
-                },
-                error: function(xhr, status, error) {
-                    // Handle API call errors
-                    let error_message = 'Unknown error occurred';
-                    
-                    if (xhr && xhr.responseJSON && xhr.responseJSON.message) {
-                        error_message = xhr.responseJSON.message;
-                    } else if (error) {
-                        error_message = error;
-                    }
-                    
-                    frm.set_value('connection_status', 'Error: ' + error_message);
-                    frm.set_value('last_test_datetime', frappe.datetime.now_datetime());
-                    
-                    frappe.show_alert({
-                        message: __('Connection Test Failed'),
-                        indicator: 'red'
-                    });
-                    
+        // The probe uses the stored credentials, so unsaved edits must be saved first
+        if (frm.is_dirty()) {
+            frappe.msgprint({
+                title: __('Unsaved Changes'),
+                message: __('Please save the settings before testing the connection'),
+                indicator: 'orange'
+            });
+            return;
+        }
+        
+        // Probe Wix without writing to the settings document
+        frappe.call({
+            method: 'zm_frappe_wix_sync.api.wix_sync.test_wix_connection',
+            freeze: true,
+            freeze_message: __('Testing connection to Wix...'),
+            callback: function(response) {
+                var result = response && response.message;
+                if (!result) {
                     frappe.msgprint({
                         title: __('Connection Test Error'),
-                        message: error_message,
+                        message: __('Received unexpected response from server'),
                         indicator: 'red'
                     });
-                    
-                    frm.save();
+                    return;
                 }
-            });
-        }).catch((error) => {
-            // Handle form save errors
-            frappe.msgprint({
-                title: __('Save Error'),
-                message: __('Could not save the settings. Please try again.'),
-                indicator: 'red'
-            });
+                
+                frappe.show_alert({
+                    message: result.success ? __('Connection Test Successful!') : __('Connection Test Failed'),
+                    indicator: result.success ? 'green' : 'red'
+                });
+                
+                frappe.msgprint({
+                    title: result.success ? __('Connection Successful') : __('Connection Failed'),
+                    message: result.message,
+                    indicator: result.success ? 'green' : 'red'
+                });
+                
+                if (result.checked_at) {
+                    show_connection_health(frm, result);
+                }
+            }
         });
     },
     
     refresh: function(frm) {
-        // Add custom styling or additional functionality on form refresh
-        if (frm.doc.connection_status) {
-            // Add visual indicators based on connection status
-            if (frm.doc.connection_status.startsWith('Success')) {
-                frm.dashboard.set_headline_alert(
-                    '<div class="text-success">Last connection test was successful</div>'
-                );
-            } else if (frm.doc.connection_status.startsWith('Failed') || frm.doc.connection_status.startsWith('Error')) {
-                frm.dashboard.set_headline_alert(
-                    '<div class="text-danger">Last connection test failed</div>'
-                );
+        // Connection health comes from the cached probe, not from stored fields
+        frappe.call({
+            method: 'zm_frappe_wix_sync.api.connection_health.get_connection_health',
+            callback: function(response) {
+                if (response && response.message) {
+                    show_connection_health(frm, response.message);
+                }
             }
-        }
-    },
+        });
+        
+        show_sync_queue_status(frm);
+        show_sync_dashboard(frm);
+    }
+});
+
+
+// Show the result of the latest Wix health probe as the form headline
+function show_connection_health(frm, health) {
+    var details = __('{0} ms, checked {1}', [health.latency_ms, health.checked_at]);
     
-    wix_api_key: function(frm) {
-        // Clear connection status when API key changes
-        if (frm.doc.connection_status) {
-            frm.set_value('connection_status', '');
-            frm.set_value('last_test_datetime', '');
+    if (health.success) {
+        frm.dashboard.set_headline_alert(
+            '<div class="text-success">' + __('Wix connection healthy') + ' (' + details + ')</div>'
+        );
+    } else if (health.token_valid === false) {
+        frm.dashboard.set_headline_alert(
+            '<div class="text-danger">' + __('Wix rejected the API key') + ' (' + details + ')</div>'
+        );
+    } else {
+        frm.dashboard.set_headline_alert(
+            '<div class="text-danger">' + __('Wix connection failed') + ' (' + details + ')</div>'
+        );
+    }
+}
+
+// Show queue depth and wait times for interactive and bulk sync work
+function show_sync_queue_status(frm) {
+    frappe.call({
+        method: 'zm_frappe_wix_sync.api.sync_queue.get_sync_queue_status',
+        callback: function(response) {
+            var status = response && response.message;
+            if (!status) {
+                return;
+            }
+            
+            var describe = function(label, queue) {
+                return __('{0} ({1} queue): {2} queued, oldest waiting {3}s, avg wait {4}s, max wait {5}s', [
+                    label, queue.queue, queue.queued_jobs, queue.oldest_job_wait, queue.avg_wait, queue.max_wait
+                ]);
+            };
+            
+            frm.dashboard.add_comment(
+                [
+                    describe(__('Interactive'), status.high),
+                    describe(__('Bulk'), status.low),
+                    __('Pending interactive items: {0}', [status.pending_priority_items])
+                ].join('<br>'),
+                status.pending_priority_items ? 'orange' : 'blue',
+                true
+            );
         }
-    },
-    
-    wix_site_id: function(frm) {
-        // Clear connection status when site ID changes
-        if (frm.doc.connection_status) {
-            frm.set_value('connection_status', '');
-            frm.set_value('last_test_datetime', '');
+    });
+}
+
+// Show sync health counters from the Wix Sync Status summary
+function show_sync_dashboard(frm) {
+    frappe.call({
+        method: 'zm_frappe_wix_sync.api.sync_status.get_sync_dashboard',
+        callback: function(response) {
+            var dashboard = response && response.message;
+            if (!dashboard) {
+                return;
+            }
+            
+            var counters = dashboard.counters;
+            frm.dashboard.add_indicator(__('Items Synced: {0}', [counters.items_success]), 'green');
+            frm.dashboard.add_indicator(__('Items Failing: {0}', [counters.items_error]),
+                counters.items_error ? 'red' : 'gray');
+            frm.dashboard.add_indicator(__('Attempts: {0} ({1} failed)', [counters.total_attempts, counters.total_errors]), 'blue');
+            
+            if (dashboard.recent_errors.length) {
+                frm.dashboard.add_comment(
+                    __('Recently failing: {0}', [dashboard.recent_errors.map(function(row) {
+                        return row.item_code;
+                    }).join(', ')]),
+                    'red',
+                    true
+                );
+            }
         }
-    }
-});
+    });
+}
@@ -14,10 +14,10 @@ class WixSyncSettings(Document):
             self.wix_site_id = "a57521a4-3ecd-40b8-852c-462f2af558d2"  # kokofresh site ID
 
     def on_update(self):
-        # Clear connection status on update
+        # A cached health probe was made with the old credentials
         if self.has_value_changed('wix_api_key') or self.has_value_changed('wix_site_id'):
-            self.connection_status = ""
-            self.last_test_datetime = None
+            from zm_frappe_wix_sync.api.connection_health import clear_connection_health
+            clear_connection_health()
     
     @frappe.whitelist()
     def test_connection(self):